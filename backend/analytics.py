@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+TOTALS_ID = 'totals'
+CHEF_PREFIX = 'chef:'
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+ORDER_TYPES = ('dinein', 'takeaway')
+SERVED_STATUSES = ('done', 'completed')
+
+
+def weekday(created_at):
+    return WEEKDAYS[datetime.fromisoformat(created_at).weekday()]
+
+def chef_key(name):
+    return f"{CHEF_PREFIX}{name}"
+
+def order_increments(order):
+    inc = {
+        'totalRevenue': order['grandTotal'],
+        'totalOrders': 1,
+        f"revenueByDay.{weekday(order['createdAt'])}": order['grandTotal'],
+    }
+    if order['type'] in ORDER_TYPES:
+        inc[f"ordersByType.{order['type']}"] = 1
+    if order['status'] in SERVED_STATUSES:
+        inc['ordersByType.served'] = 1
+    return inc
+
+def order_operations(order):
+    ops = [(TOTALS_ID, order_increments(order))]
+    if order.get('assignedChef'):
+        ops.append((chef_key(order['assignedChef']), {'orders': 1}))
+    return ops
+
+
+async def record_orders(store, orders):
+    ops = [op for order in orders for op in order_operations(order)]
+    if ops:
+        await store.analytics.increment(ops)
+
+async def record_order(store, order):
+    await record_orders(store, [order])
+
+async def record_served(store, count):
+    if count:
+        await store.analytics.increment([(TOTALS_ID, {'ordersByType.served': count})])
+
+async def record_status_change(store, old_status, new_status):
+    delta = (new_status in SERVED_STATUSES) - (old_status in SERVED_STATUSES)
+    await record_served(store, delta)
+
+
+async def read(store, chef_names):
+    keys = [TOTALS_ID] + [chef_key(name) for name in chef_names]
+    docs = {d['_id']: d for d in await store.analytics.get_many(keys)}
+    totals = docs.get(TOTALS_ID, {})
+    by_type = totals.get('ordersByType', {})
+    by_day = totals.get('revenueByDay', {})
+    return {
+        'totalRevenue': totals.get('totalRevenue', 0),
+        'totalOrders': totals.get('totalOrders', 0),
+        'ordersByType': {t: by_type.get(t, 0) for t in ORDER_TYPES + ('served',)},
+        'revenueByDay': [{'day': day, 'revenue': by_day[day]} for day in WEEKDAYS if day in by_day],
+        'chefOrderDistribution': [
+            {'name': name, 'orders': docs.get(chef_key(name), {}).get('orders', 0)} for name in chef_names
+        ],
+    }
+
+
+def range_pipeline(start=None, end=None):
+    created_at = {}
+    if start:
+        created_at['$gte'] = start
+    if end:
+        created_at['$lt'] = end
+    return [
+        {'$match': {'createdAt': created_at} if created_at else {}},
+        {'$project': {'_id': 0, 'grandTotal': 1, 'type': 1, 'status': 1, 'assignedChef': 1, 'createdAt': 1}},
+        {'$facet': {
+            'totals': [{'$group': {
+                '_id': None,
+                'totalRevenue': {'$sum': '$grandTotal'},
+                'totalOrders': {'$sum': 1},
+                'served': {'$sum': {'$cond': [{'$in': ['$status', list(SERVED_STATUSES)]}, 1, 0]}},
+            }}],
+            'ordersByType': [{'$group': {'_id': '$type', 'count': {'$sum': 1}}}],
+            'revenueByDay': [{'$group': {
+                '_id': {'$isoDayOfWeek': {'$dateFromString': {'dateString': {'$substrBytes': ['$createdAt', 0, 10]}}}},
+                'revenue': {'$sum': '$grandTotal'},
+            }}],
+            'chefOrderDistribution': [
+                {'$match': {'assignedChef': {'$ne': None}}},
+                {'$group': {'_id': '$assignedChef', 'orders': {'$sum': 1}}},
+            ],
+        }},
+    ]
+
+async def read_range(store, chef_names, start=None, end=None):
+    result = await store.orders.summarize(start, end)
+    totals = result['totals'][0] if result['totals'] else {}
+    by_type = {row['_id']: row['count'] for row in result['ordersByType']}
+    by_day = {WEEKDAYS[row['_id'] - 1]: row['revenue'] for row in result['revenueByDay']}
+    by_chef = {row['_id']: row['orders'] for row in result['chefOrderDistribution']}
+    return {
+        'totalRevenue': totals.get('totalRevenue', 0),
+        'totalOrders': totals.get('totalOrders', 0),
+        'ordersByType': {**{t: by_type.get(t, 0) for t in ORDER_TYPES}, 'served': totals.get('served', 0)},
+        'revenueByDay': [{'day': day, 'revenue': by_day[day]} for day in WEEKDAYS if day in by_day],
+        'chefOrderDistribution': [{'name': name, 'orders': by_chef.get(name, 0)} for name in chef_names],
+    }
+
+
+async def rebuild(store, batch_size=5000):
+    totals = {'totalRevenue': 0, 'totalOrders': 0, 'ordersByType': {t: 0 for t in ORDER_TYPES + ('served',)}, 'revenueByDay': {}}
+    chefs = {}
+    async for order in store.orders.scan(batch_size=batch_size):
+        totals['totalRevenue'] += order['grandTotal']
+        totals['totalOrders'] += 1
+        if order['type'] in ORDER_TYPES:
+            totals['ordersByType'][order['type']] += 1
+        if order['status'] in SERVED_STATUSES:
+            totals['ordersByType']['served'] += 1
+        day = weekday(order['createdAt'])
+        totals['revenueByDay'][day] = totals['revenueByDay'].get(day, 0) + order['grandTotal']
+        if order.get('assignedChef'):
+            chefs[order['assignedChef']] = chefs.get(order['assignedChef'], 0) + 1
+    docs = [{'_id': TOTALS_ID, **totals}] + [{'_id': chef_key(name), 'orders': n} for name, n in chefs.items()]
+    await store.analytics.replace_all(docs)
+    return totals
+
+
+async def ensure(store):
+    if not await store.analytics.get(TOTALS_ID):
+        await rebuild(store)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from repositories import open_store
+
+    load_dotenv(Path(__file__).parent / ".env")
+    if sys.argv[1:] != ['rebuild']:
+        sys.exit("usage: python analytics.py rebuild")
+    store = open_store('mongo', os.getenv("MONGO_URI") or os.getenv("MONGO_URL"), os.getenv("DB_NAME", "restaurant"))
+    totals = asyncio.run(rebuild(store))
+    print(f"Rebuilt analytics from {totals['totalOrders']} orders")
+    store.close()
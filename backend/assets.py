@@ -0,0 +1,105 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from fastapi import Response
+
+
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{8,}\.')
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 1024
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+mimetypes.add_type("application/json", ".map")
+
+
+class Asset:
+    def __init__(self, body, media_type, cache_control, variants):
+        self.body = body
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.variants = variants
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class StaticAssets:
+    """The built frontend, held in memory and served without touching the disk.
+
+    ``load()`` reads every file under ``directory`` once, along with the
+    ``.br`` and ``.gz`` files build.sh writes next to them; text files with no
+    ``.gz`` are gzipped at load instead. Files whose names carry a content
+    hash (``main.9f6001a5.js``) are cached by browsers for a year, everything
+    else is revalidated against its ETag.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._assets = {}
+
+    def __len__(self):
+        return len(self._assets)
+
+    def load(self):
+        assets = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(('.gz', '.br')):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    body = f.read()
+                media_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                variants = {}
+                for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+                    if os.path.exists(path + suffix):
+                        with open(path + suffix, 'rb') as f:
+                            variants[encoding] = f.read()
+                if 'gzip' not in variants and len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE):
+                    variants['gzip'] = gzip.compress(body, 6, mtime=0)
+                variants = {e: v for e, v in variants.items() if len(v) < len(body)}
+                cache_control = IMMUTABLE if FINGERPRINTED.search(name) else REVALIDATE
+                url = '/' + os.path.relpath(path, self.directory).replace(os.sep, '/')
+                assets[url] = Asset(body, media_type, cache_control, variants)
+        self._assets = assets
+
+    def get(self, path):
+        """The asset at URL ``path``, also accepting the ``/static/static/...`` form of the old mount."""
+        asset = self._assets.get(path)
+        if asset is None and path.startswith('/static/'):
+            asset = self._assets.get(path[len('/static'):])
+        return asset
+
+    def response(self, request, asset):
+        headers = {'Cache-Control': asset.cache_control, 'ETag': asset.etag}
+        if asset.variants:
+            headers['Vary'] = 'Accept-Encoding'
+        if asset.etag in [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]:
+            return Response(status_code=304, headers=headers)
+        body = asset.body
+        accepted = accepted_encodings(request.headers.get('accept-encoding', ''))
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in asset.variants:
+                body = asset.variants[encoding]
+                headers['Content-Encoding'] = encoding
+                break
+        return Response(body if request.method != 'HEAD' else b'', media_type=asset.media_type, headers={
+            **headers, 'Content-Length': str(len(body))
+        })
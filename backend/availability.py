@@ -0,0 +1,83 @@
+import bisect
+
+from reloading import Reloader
+
+
+class TableAvailabilityIndex:
+    """Free tables bucketed by chair count for best-fit seating.
+
+    ``_sizes`` holds the sorted chair counts that currently have at least one
+    free table, so the best fit for a party is one bisect away. Handlers that
+    change a table's status call ``set_status``. Tables seated or freed by
+    another server process are picked up by the reload every ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl=30):
+        self._tables = {}
+        self._ids_by_number = {}
+        self._free = {}
+        self._sizes = []
+        self._reloader = Reloader(self._reload, ttl)
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._free.values())
+
+    def _add_free(self, table):
+        bucket = self._free.setdefault(table['chairCount'], [])
+        if not bucket:
+            bisect.insort(self._sizes, table['chairCount'])
+        bisect.insort(bucket, (table['number'], table['id']))
+
+    def _remove_free(self, table):
+        bucket = self._free.get(table['chairCount'], [])
+        i = bisect.bisect_left(bucket, (table['number'], table['id']))
+        if i < len(bucket) and bucket[i][1] == table['id']:
+            del bucket[i]
+            if not bucket:
+                self._sizes.remove(table['chairCount'])
+
+    def load(self, tables):
+        self._tables, self._ids_by_number, self._free, self._sizes = {}, {}, {}, []
+        for table in tables:
+            self.upsert(table)
+
+    async def _reload(self, store):
+        self.load(await store.tables.all())
+
+    def invalidate(self):
+        self._reloader.invalidate()
+
+    def upsert(self, table):
+        self.remove(table['id'])
+        table = dict(table)
+        self._tables[table['id']] = table
+        self._ids_by_number[table['number']] = table['id']
+        if table.get('status', 'available') == 'available':
+            self._add_free(table)
+
+    def remove(self, table_id):
+        table = self._tables.pop(table_id, None)
+        if table:
+            self._remove_free(table)
+            if self._ids_by_number.get(table['number']) == table_id:
+                del self._ids_by_number[table['number']]
+
+    def set_status(self, table_id=None, number=None, status='available'):
+        table_id = table_id or self._ids_by_number.get(number)
+        if table_id in self._tables:
+            self.upsert({**self._tables[table_id], 'status': status})
+
+    async def _ensure(self, store):
+        await self._reloader.ensure(store)
+
+    async def all_tables(self, store):
+        await self._ensure(store)
+        return sorted(self._tables.values(), key=lambda t: t['number'])
+
+    async def best_fit(self, store, party):
+        await self._ensure(store)
+        i = bisect.bisect_left(self._sizes, party)
+        if i == len(self._sizes):
+            return None
+        _, table_id = self._free[self._sizes[i]][0]
+        return self._tables[table_id]
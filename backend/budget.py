@@ -0,0 +1,169 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+
+from pymongo import monitoring
+
+from metrics import command_collection
+
+
+logger = logging.getLogger(__name__)
+
+current_usage = contextvars.ContextVar('current_usage', default=None)
+in_repository = contextvars.ContextVar('in_repository', default=False)
+
+
+class Usage:
+    """Database round trips and time spent on them during one request.
+
+    ``commands`` counts each target (``orders.find`` for Mongo,
+    ``orders.page`` for the in-memory store) so a handler issuing the same
+    call in a loop shows up as an N+1. Further batches of an open cursor add
+    their time but are part of the query that opened it, not round trips of
+    their own.
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+        self.seconds = 0.0
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    def record(self, target, seconds, round_trip=True):
+        with self._lock:
+            self.seconds += seconds
+            if round_trip:
+                self.round_trips += 1
+                self.commands[target] = self.commands.get(target, 0) + 1
+
+    def repeated(self, limit):
+        return sorted(((n, target) for target, n in self.commands.items() if n > limit), reverse=True)
+
+
+def record(target, seconds, round_trip=True):
+    usage = current_usage.get()
+    if usage is not None:
+        usage.record(target, seconds, round_trip)
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Adds every Mongo command to the ``Usage`` of the request that issued it.
+
+    Motor runs pymongo in executor threads with the caller's context copied,
+    so ``current_usage`` here is the one the middleware set for the request.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if current_usage.get() is None:
+            return
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _finish(self, event):
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), None)
+        if collection is not None:
+            target = f"{collection}.{event.command_name}" if collection else event.command_name
+            record(target, event.duration_micros / 1e6, round_trip=event.command_name != 'getMore')
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+
+def timed(target, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if in_repository.get():
+            return await method(*args, **kwargs)
+        token = in_repository.set(True)
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record(target, time.perf_counter() - started)
+            in_repository.reset(token)
+    return wrapper
+
+def instrument(store):
+    """Count every repository call on ``store`` as a round trip, for stores without a command listener.
+
+    Calls a repository makes to itself are part of the outer round trip.
+    """
+    for name, repository in vars(store).items():
+        for attr in dir(repository):
+            method = getattr(repository, attr)
+            if not attr.startswith('_') and inspect.iscoroutinefunction(method):
+                setattr(repository, attr, timed(f"{name}.{attr}", method))
+    return store
+
+
+class RoundTripBudget:
+    """ASGI middleware enforcing a per-request database round-trip budget.
+
+    Adds a ``Server-Timing`` header with the request's database time and
+    round trips. A request over ``limit`` round trips, or repeating one
+    command more than ``repeat_limit`` times, is logged; with
+    ``mode="fail"`` (for test runs) it is answered with a 500 instead, as
+    long as the response has not started streaming. Work done after the
+    response starts is only logged.
+    """
+
+    def __init__(self, app, limit=10, repeat_limit=3, mode="log"):
+        self.app = app
+        self.limit = limit
+        self.repeat_limit = repeat_limit
+        self.mode = mode
+
+    def violations(self, usage):
+        found = []
+        if self.limit and usage.round_trips > self.limit:
+            found.append(f"{usage.round_trips} database round trips (budget {self.limit})")
+        found += [f"possible N+1: {target} ran {n} times" for n, target in usage.repeated(self.repeat_limit)]
+        return found
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        usage = Usage()
+        token = current_usage.set(usage)
+        started = time.perf_counter()
+        rejected = False
+
+        async def send_with_timing(message):
+            nonlocal rejected
+            if rejected:
+                return
+            if message['type'] == 'http.response.start':
+                violations = self.violations(usage)
+                if violations and self.mode == "fail":
+                    rejected = True
+                    body = json.dumps({'detail': "; ".join(violations)}).encode()
+                    await send({'type': 'http.response.start', 'status': 500, 'headers': [
+                        (b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())
+                    ]})
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+                timing = (
+                    f'db;dur={usage.seconds * 1000:.1f};desc="{usage.round_trips} round trips", '
+                    f'app;dur={(time.perf_counter() - started) * 1000:.1f}'
+                )
+                message = {**message, 'headers': list(message.get('headers', [])) + [(b'server-timing', timing.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_usage.reset(token)
+            for violation in self.violations(usage):
+                logger.warning("%s %s: %s", scope['method'], scope['path'], violation)
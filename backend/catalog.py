@@ -0,0 +1,73 @@
+import hashlib
+import json
+
+from reloading import Reloader
+
+
+class MenuCatalog:
+    """In-memory copy of the menu indexed by id and by category.
+
+    Menu writes call ``invalidate()``; the next read reloads the whole
+    collection once. Edits made through another server process show up
+    once ``ttl`` has passed.
+    """
+
+    def __init__(self, ttl=30):
+        self._items = []
+        self._by_id = {}
+        self._by_category = {}
+        self._etag = None
+        self._encoded = {}
+        self._reloader = Reloader(self._load, ttl)
+
+    def __len__(self):
+        return len(self._items)
+
+    def invalidate(self):
+        self._reloader.invalidate()
+
+    async def _load(self, store):
+        items = await store.menu.all()
+        by_category = {}
+        for item in items:
+            by_category.setdefault(item['category'], []).append(item)
+        digest = hashlib.sha1(json.dumps(items, sort_keys=True, default=str).encode()).hexdigest()
+        self._items = items
+        self._by_id = {item['id']: item for item in items}
+        self._by_category = by_category
+        self._etag = f'W/"menu-{digest[:16]}"'
+        self._encoded = {}
+
+    async def _ensure(self, store):
+        await self._reloader.ensure(store)
+
+    async def etag(self, store):
+        await self._ensure(store)
+        return self._etag
+
+    async def items(self, store, category=None):
+        await self._ensure(store)
+        if category:
+            return self._by_category.get(category, [])
+        return self._items
+
+    async def encoded(self, store, category, encode):
+        """``encode(items(category))``, computed once per load of the catalog."""
+        await self._ensure(store)
+        if category and category not in self._by_category:
+            return encode([])
+        if category not in self._encoded:
+            self._encoded[category] = encode(self._by_category[category] if category else self._items)
+        return self._encoded[category]
+
+    async def get(self, store, item_id):
+        await self._ensure(store)
+        return self._by_id.get(item_id)
+
+    async def get_many(self, store, item_ids):
+        await self._ensure(store)
+        return {item_id: self._by_id[item_id] for item_id in item_ids if item_id in self._by_id}
+
+    async def categories(self, store):
+        await self._ensure(store)
+        return sorted(self._by_category)
@@ -0,0 +1,44 @@
+import collections
+import time
+
+from reloading import fresh
+
+
+class CustomerDirectory:
+    """Bounded LRU cache of customers by phone number.
+
+    Unknown phones are cached as ``None`` too, so the returning-customer
+    check costs one read per phone. Writers call ``invalidate(phones)``
+    once their customer write is committed, and a lookup that overlapped a
+    write is not cached. Each entry is re-read after ``ttl`` seconds so a
+    customer updated through another server process is not served stale
+    for long.
+    """
+
+    def __init__(self, capacity=10000, ttl=30):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._writes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, phones):
+        self._writes += 1
+        for phone in phones:
+            self._entries.pop(phone, None)
+
+    async def get(self, store, phone):
+        entry = self._entries.get(phone)
+        if entry is not None and fresh(entry[0], self.ttl):
+            self._entries.move_to_end(phone)
+            return entry[1]
+        writes = self._writes
+        customer = await store.customers.get(phone)
+        if writes == self._writes and self.capacity > 0:
+            self._entries[phone] = (time.monotonic(), customer)
+            self._entries.move_to_end(phone)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return customer
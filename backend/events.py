@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+
+HEARTBEAT = b": ping\n\n"
+
+
+class _Subscriber:
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+
+class OrderEventHub:
+    """Fan-out of order change events as pre-encoded Server-Sent Events.
+
+    Each event is serialized once and handed to every subscriber queue. The
+    last ``history`` events are kept so a reconnecting client can resume
+    from its ``Last-Event-ID``; ids carry a per-process epoch, and a client
+    whose id is unknown or too old gets a ``reset`` event telling it to
+    refetch the full list. Slow subscribers whose queue fills up are
+    dropped the same way.
+    """
+
+    def __init__(self, history=1000, queue_size=1000):
+        self.epoch = f"{int(time.time() * 1000):x}"
+        self._queue_size = queue_size
+        self._last_id = 0
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def _encode(self, event, data, event_id=None):
+        lines = [f"id: {self.epoch}-{event_id}"] if event_id is not None else []
+        lines += [f"event: {event}", f"data: {json.dumps(data, default=str)}"]
+        return ("\n".join(lines) + "\n\n").encode()
+
+    def publish(self, event, data):
+        self._last_id += 1
+        payload = self._encode(event, data, self._last_id)
+        self._history.append((self._last_id, payload))
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self._subscribers.discard(subscriber)
+
+    def _backlog(self, last_event_id):
+        if not last_event_id:
+            return []
+        epoch, _, number = last_event_id.partition('-')
+        oldest = self._history[0][0] if self._history else self._last_id + 1
+        if epoch != self.epoch or not number.isdigit() or int(number) < oldest - 1:
+            return [self._encode('reset', {})]
+        return [payload for event_id, payload in self._history if event_id > int(number)]
+
+    async def stream(self, last_event_id=None, heartbeat=15):
+        subscriber = _Subscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            for payload in self._backlog(last_event_id):
+                yield payload
+            while not subscriber.overflowed or not subscriber.queue.empty():
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+            yield self._encode('reset', {})
+        finally:
+            self._subscribers.discard(subscriber)
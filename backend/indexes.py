@@ -0,0 +1,137 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEXES = {
+    'orders': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        IndexModel([('createdAt', ASCENDING), ('id', ASCENDING)]),
+        IndexModel([('status', ASCENDING), ('createdAt', DESCENDING), ('id', DESCENDING)]),
+        IndexModel([('type', ASCENDING), ('createdAt', DESCENDING), ('id', DESCENDING)]),
+        IndexModel([('updatedAt', ASCENDING), ('id', ASCENDING)]),
+    ],
+    'menu_items': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        IndexModel([('category', ASCENDING)]),
+    ],
+    'tables': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        IndexModel([('number', ASCENDING)], unique=True),
+    ],
+    'chefs': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        IndexModel([('name', ASCENDING)]),
+        IndexModel([('currentOrders', ASCENDING)]),
+    ],
+    'customers': [
+        IndexModel([('phone', ASCENDING)], unique=True),
+    ],
+    'reservations': [
+        IndexModel([('id', ASCENDING)], unique=True),
+        IndexModel([('tableId', ASCENDING), ('start', ASCENDING)]),
+        IndexModel([('end', ASCENDING)]),
+    ],
+}
+
+HOT_QUERIES = [
+    ('orders by id', 'orders', {'id': 'order_0'}, None),
+    ('orders list', 'orders', {}, [('createdAt', DESCENDING), ('id', DESCENDING)]),
+    ('orders by status', 'orders', {'status': 'processing'}, [('createdAt', DESCENDING), ('id', DESCENDING)]),
+    ('orders by type', 'orders', {'type': 'dinein'}, [('createdAt', DESCENDING), ('id', DESCENDING)]),
+    ('orders page', 'orders', {'$or': [
+        {'createdAt': {'$lt': '2100-01-01T00:00:00+00:00'}},
+        {'createdAt': '2100-01-01T00:00:00+00:00', 'id': {'$lt': 'order_0'}},
+    ]}, [('createdAt', DESCENDING), ('id', DESCENDING)]),
+    ('orders changed since', 'orders', {'updatedAt': {'$gte': '2000-01-01T00:00:00+00:00'}},
+     [('updatedAt', ASCENDING), ('id', ASCENDING)]),
+    ('orders changes page', 'orders', {'$or': [
+        {'updatedAt': {'$gt': '2000-01-01T00:00:00+00:00'}},
+        {'updatedAt': '2000-01-01T00:00:00+00:00', 'id': {'$gt': 'order_0'}},
+    ]}, [('updatedAt', ASCENDING), ('id', ASCENDING)]),
+    ('orders by date range', 'orders', {'createdAt': {'$gte': '2000-01-01T00:00:00+00:00'}}, None),
+    ('menu item by id', 'menu_items', {'id': 'menu_0'}, None),
+    ('menu by category', 'menu_items', {'category': 'Pizza'}, None),
+    ('table by id', 'tables', {'id': 'table_0'}, None),
+    ('table by number', 'tables', {'number': 1}, None),
+    ('tables list', 'tables', {}, [('number', ASCENDING)]),
+    ('chef by id', 'chefs', {'id': 'chef_0'}, None),
+    ('chef by name', 'chefs', {'name': 'chef'}, None),
+    ('least loaded chef', 'chefs', {}, [('currentOrders', ASCENDING)]),
+    ('customer by phone', 'customers', {'phone': '0000000000'}, None),
+    ('reservation overlap', 'reservations', {
+        'tableId': 'table_0', 'start': {'$lt': '2100-01-01T00:00:00+00:00'}, 'end': {'$gt': '2000-01-01T00:00:00+00:00'},
+    }, None),
+    ('reservations still ahead', 'reservations', {'end': {'$gt': '2000-01-01T00:00:00+00:00'}}, None),
+    ('customers page', 'customers', {'phone': {'$gt': '0000000000'}}, [('phone', ASCENDING)]),
+]
+
+
+async def ensure_indexes(db):
+    failed = []
+    for collection, models in INDEXES.items():
+        for model in models:
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                failed.append((collection, model.document['name']))
+                logger.error("Could not create index %s.%s: %s", collection, model.document['name'], e)
+    return failed
+
+
+async def index_report(db):
+    report = {'missing': [], 'unused': [], 'undeclared': []}
+    for collection, models in INDEXES.items():
+        declared = {model.document['name'] for model in models}
+        existing = set((await db[collection].index_information()).keys()) - {'_id_'}
+        report['missing'] += [(collection, name) for name in sorted(declared - existing)]
+        report['undeclared'] += [(collection, name) for name in sorted(existing - declared)]
+        try:
+            stats = await db[collection].aggregate([{'$indexStats': {}}]).to_list(None)
+        except OperationFailure:
+            stats = []
+        report['unused'] += [
+            (collection, s['name']) for s in stats
+            if s['name'] in declared and s['accesses']['ops'] == 0
+        ]
+    return report
+
+
+def plan_stages(plan):
+    stages = [plan.get('stage')]
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            stages += plan_stages(plan[key])
+    for child in plan.get('inputStages', []):
+        stages += plan_stages(child)
+    return stages
+
+
+async def collection_scans(db):
+    offenders = []
+    for name, collection, query, sort in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = plan_stages(explain['queryPlanner']['winningPlan'])
+        if 'COLLSCAN' in stages:
+            offenders.append((name, stages))
+    return offenders
+
+
+async def bootstrap(db):
+    failed = await ensure_indexes(db)
+    report = await index_report(db)
+    for collection, name in report['missing']:
+        if (collection, name) not in failed:
+            logger.warning("Index %s.%s is missing", collection, name)
+    for collection, name in report['undeclared']:
+        logger.warning("Index %s.%s is not declared in indexes.INDEXES", collection, name)
+    for collection, name in report['unused']:
+        logger.info("Index %s.%s has no recorded accesses since mongod started", collection, name)
+    return report
@@ -0,0 +1,153 @@
+import bisect
+import time
+from datetime import datetime, timezone
+
+
+def timestamp(value):
+    return datetime.fromisoformat(value).timestamp()
+
+def isoformat(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class ChefQueue:
+    def __init__(self, parallel=False):
+        self.parallel = parallel
+        self.keys = []
+        self.orders = {}
+        self.started = None
+        self._times = None
+        self.view = None
+
+    def changed(self):
+        self._times = None
+        self.view = None
+
+    def times(self):
+        """``{order_id: (starts, ready)}`` timestamps, in cooking order."""
+        if self._times is None:
+            times = {}
+            ready = self.started
+            for position, (created, order_id) in enumerate(self.keys):
+                if self.parallel:
+                    starts = created
+                else:
+                    starts = self.started if position == 0 else max(ready, created)
+                ready = starts + self.orders[order_id]['processingTime']
+                times[order_id] = (starts, ready)
+            self._times = times
+        return self._times
+
+    def rows(self):
+        if self.view is None:
+            rows = []
+            for position, (order_id, (starts, ready)) in enumerate(self.times().items()):
+                order = self.orders[order_id]
+                rows.append({
+                    'id': order_id,
+                    'orderNumber': order['orderNumber'],
+                    'type': order['type'],
+                    'tableNumber': order.get('tableNumber'),
+                    'createdAt': order['createdAt'],
+                    'processingTime': order['processingTime'],
+                    'position': position,
+                    'startsAt': isoformat(starts),
+                    'readyAt': isoformat(ready),
+                })
+            self.view = rows
+        return self.view
+
+
+class KitchenQueue:
+    """Per-chef work lists of processing orders, in cooking order, with ETAs.
+
+    A chef cooks one order at a time, oldest first. An order starts when
+    the one ahead of it is ready, or when it was placed if the chef was
+    idle, so its ETA is the sum of the queued ``processingTime`` ahead of
+    it. Orders with no chef are not one cook's work, so each is estimated
+    from its own ``createdAt``. ``add`` and ``remove`` touch only the
+    affected chef's list, whose rows are recomputed on the next ``view()``.
+
+    The ETAs are for display only: the order scheduler still marks an order
+    done at ``createdAt + processingTime``.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._epoch = int(time.time())
+        self._queues = {}
+        self._chef_of = {}
+        self._view = None
+
+    def __len__(self):
+        return len(self._chef_of)
+
+    @property
+    def etag(self):
+        return f'W/"kitchen-{self._epoch}-{self.version}"'
+
+    def _changed(self, chef):
+        if chef in self._queues:
+            self._queues[chef].changed()
+        self._view = None
+        self.version += 1
+
+    def rebuild(self, orders):
+        self._queues = {}
+        self._chef_of = {}
+        for order in sorted(orders, key=lambda o: (o['createdAt'], o['id'])):
+            self.add(order)
+        self._view = None
+        self.version += 1
+
+    def add(self, order):
+        if order['id'] in self._chef_of:
+            return
+        chef = order.get('assignedChef')
+        queue = self._queues.setdefault(chef, ChefQueue(parallel=chef is None))
+        created = timestamp(order['createdAt'])
+        key = (created, order['id'])
+        if not queue.keys:
+            queue.started = created
+        # The head is already on the stove; an older order queues behind it.
+        bisect.insort(queue.keys, key, lo=min(1, len(queue.keys)))
+        queue.orders[order['id']] = dict(order)
+        self._chef_of[order['id']] = chef
+        self._changed(chef)
+
+    def remove(self, order_id, now=None):
+        if order_id not in self._chef_of:
+            return
+        chef = self._chef_of.pop(order_id)
+        queue = self._queues[chef]
+        order = queue.orders.pop(order_id)
+        was_head = queue.keys[0][1] == order_id
+        queue.keys.remove((timestamp(order['createdAt']), order_id))
+        if not queue.keys:
+            del self._queues[chef]
+        elif was_head:
+            queue.started = max(now if now is not None else time.time(), queue.keys[0][0])
+        self._changed(chef)
+
+    def close_table_gap(self, number):
+        """Shift table numbers past a deleted table down by one, as ``orders.close_table_gap`` does."""
+        for chef, queue in list(self._queues.items()):
+            orders = [o for o in queue.orders.values() if o['type'] == 'dinein' and (o.get('tableNumber') or 0) > number]
+            for order in orders:
+                order['tableNumber'] -= 1
+            if orders:
+                self._changed(chef)
+
+    def view(self):
+        if self._view is None:
+            chefs = []
+            for chef in sorted(self._queues, key=lambda c: (c is None, c or '')):
+                rows = self._queues[chef].rows()
+                chefs.append({
+                    'chef': chef,
+                    'queuedSeconds': sum(row['processingTime'] for row in rows),
+                    'readyAt': max(row['readyAt'] for row in rows),
+                    'orders': rows,
+                })
+            self._view = {'version': self.version, 'chefs': chefs}
+        return self._view
@@ -0,0 +1,212 @@
+import bisect
+import threading
+import time
+
+from pymongo import monitoring
+
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{n}="{escape(v)}"' for n, v in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [f"{self.name}{format_labels(self.labels, k)} {format_value(v)}" for k, v in values]
+
+
+class Gauge(Counter):
+    """A value that goes up and down, or is read from ``callback`` at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name, help, labels=(), callback=None):
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def render(self):
+        if self.callback is not None:
+            return self.header() + [f"{self.name} {format_value(self.callback())}"]
+        return super().render()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, *labels, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self):
+        with self._lock:
+            series = sorted((k, (list(counts), total)) for k, (counts, total) in self._series.items())
+        lines = self.header()
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = format_labels(self.labels, labels, [('le', format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetrics:
+    """ASGI middleware timing every HTTP request by method and route template.
+
+    The router records the matched endpoint in the scope, so the template
+    (``/api/orders/{order_id}``) is looked up after the request finishes;
+    requests that match no route are reported as ``unmatched``. Streaming
+    responses such as the order event stream are timed until they close.
+    """
+
+    def __init__(self, app, registry):
+        self.app = app
+        self.in_flight = registry.register(Gauge(
+            "http_requests_in_flight", "HTTP requests currently being served.", ["method"]
+        ))
+        self.requests = registry.register(Counter(
+            "http_requests_total", "HTTP requests served.", ["method", "route", "status"]
+        ))
+        self.duration = registry.register(Histogram(
+            "http_request_duration_seconds", "HTTP request latency.", ["method", "route"]
+        ))
+        self._templates = None
+
+    def route_template(self, scope):
+        if self._templates is None:
+            self._templates = {}
+            for route in scope['app'].routes:
+                endpoint = getattr(route, 'endpoint', None) or getattr(route, 'app', None)
+                path = route.path if hasattr(route, 'endpoint') else f"{route.path}/{{path}}"
+                self._templates.setdefault(endpoint, path)
+        return self._templates.get(scope.get('endpoint'), 'unmatched')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        method = scope['method']
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        self.in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight.dec(method)
+            route = self.route_template(scope)
+            self.requests.inc(method, route, str(status))
+            self.duration.observe(method, route, value=elapsed)
+
+
+def command_collection(event):
+    command = event.command
+    collection = command.get('collection') if event.command_name == 'getMore' else command.get(event.command_name)
+    return collection if isinstance(collection, str) else ''
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """pymongo listener counting and timing commands per collection and command name.
+
+    pymongo calls listeners from Motor's executor threads; the metrics take
+    their own locks.
+    """
+
+    def __init__(self, registry):
+        self.commands = registry.register(Counter(
+            "mongodb_commands_total", "MongoDB commands sent.", ["collection", "command", "outcome"]
+        ))
+        self.duration = registry.register(Histogram(
+            "mongodb_command_duration_seconds", "MongoDB command latency.", ["collection", "command"]
+        ))
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = command_collection(event)
+
+    def _finish(self, event, outcome):
+        with self._lock:
+            collection = self._pending.pop((event.connection_id, event.request_id), '')
+        self.commands.inc(collection, event.command_name, outcome)
+        self.duration.observe(collection, event.command_name, value=event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, 'success')
+
+    def failed(self, event):
+        self._finish(event, 'failure')
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+
+def fresh(stamp, ttl):
+    """Whether a ``time.monotonic()`` ``stamp`` is less than ``ttl`` seconds old."""
+    return stamp is not None and time.monotonic() - stamp < ttl
+
+
+class Reloader:
+    """Calls ``load(store)`` when the last load is older than ``ttl`` or was invalidated.
+
+    Concurrent callers wait on the same load. An ``invalidate()`` that lands
+    while a load is running makes the next ``ensure()`` load again.
+    """
+
+    def __init__(self, load, ttl=30):
+        self.ttl = ttl
+        self._load = load
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._version += 1
+
+    def fresh(self):
+        return self._loaded_version == self._version and fresh(self._loaded_at, self.ttl)
+
+    async def ensure(self, store):
+        if self.fresh():
+            return
+        async with self._lock:
+            if self.fresh():
+                return
+            version = self._version
+            await self._load(store)
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
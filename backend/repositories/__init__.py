@@ -0,0 +1,21 @@
+from repositories.memory import MemoryStore
+from repositories.mongo import MongoStore
+
+
+BACKENDS = ('mongo', 'memory')
+
+
+def open_store(backend, uri=None, db_name="restaurant", transactions="auto", **client_options):
+    """Return the repositories for ``backend``: ``"mongo"`` (needs ``uri``) or ``"memory"``."""
+    if backend == 'memory':
+        return MemoryStore()
+    if backend == 'mongo':
+        if not uri:
+            raise RuntimeError(
+                "Missing MongoDB connection string. Set MONGO_URI or MONGO_URL environment variable."
+            )
+        return MongoStore(uri, db_name, transactions, **client_options)
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+__all__ = ['BACKENDS', 'MemoryStore', 'MongoStore', 'open_store']
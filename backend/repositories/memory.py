@@ -0,0 +1,435 @@
+import bisect
+from datetime import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+import analytics
+
+
+def project(doc):
+    return dict(doc) if doc is not None else None
+
+
+class SortedIndex:
+    """Sorted ``(key, id)`` pairs for range scans, kept in step with a dict of documents."""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, key, doc_id):
+        bisect.insort(self.entries, (key, doc_id))
+
+    def remove(self, key, doc_id):
+        i = bisect.bisect_left(self.entries, (key, doc_id))
+        if i < len(self.entries) and self.entries[i] == (key, doc_id):
+            del self.entries[i]
+
+    def ascending(self, low=None, high=None):
+        i = bisect.bisect_left(self.entries, (low,)) if low is not None else 0
+        j = bisect.bisect_left(self.entries, (high,)) if high is not None else len(self.entries)
+        return (doc_id for _, doc_id in self.entries[i:j])
+
+    def following(self, key, doc_id):
+        i = bisect.bisect_right(self.entries, (key, doc_id))
+        return (doc_id for _, doc_id in self.entries[i:])
+
+    def descending(self, before=None):
+        i = bisect.bisect_left(self.entries, before) if before is not None else len(self.entries)
+        return (self.entries[n][1] for n in range(i - 1, -1, -1))
+
+
+class MemoryMenuRepository:
+    def __init__(self):
+        self._by_id = {}
+
+    async def insert(self, item):
+        if item['id'] in self._by_id:
+            raise DuplicateKeyError(f"duplicate menu item {item['id']}")
+        self._by_id[item['id']] = project(item)
+
+    async def all(self):
+        return [project(item) for item in self._by_id.values()]
+
+    async def get_many(self, item_ids, fields=None):
+        items = [self._by_id[i] for i in item_ids if i in self._by_id]
+        if fields:
+            return [{f: item[f] for f in fields if f in item} for item in items]
+        return [project(item) for item in items]
+
+    async def update(self, item_id, fields):
+        item = self._by_id.get(item_id)
+        if item is None:
+            return None
+        item.update(fields)
+        return project(item)
+
+    async def delete(self, item_id):
+        return self._by_id.pop(item_id, None) is not None
+
+
+class MemoryTableRepository:
+    def __init__(self):
+        self._by_id = {}
+        self._by_number = {}
+        self._numbers = []
+
+    async def insert(self, table):
+        if table['id'] in self._by_id or table['number'] in self._by_number:
+            raise DuplicateKeyError(f"duplicate table {table['id']} / {table['number']}")
+        table = project(table)
+        self._by_id[table['id']] = table
+        self._by_number[table['number']] = table
+        bisect.insort(self._numbers, table['number'])
+
+    async def all(self):
+        return [project(self._by_number[n]) for n in self._numbers]
+
+    async def get(self, table_id, session=None):
+        return project(self._by_id.get(table_id))
+
+    async def get_by_numbers(self, numbers):
+        return [project(self._by_number[n]) for n in set(numbers) if n in self._by_number]
+
+    async def last_number(self):
+        return self._numbers[-1] if self._numbers else 0
+
+    async def update(self, table_id, fields):
+        table = self._by_id.get(table_id)
+        if table is None:
+            return None
+        table.update(fields)
+        return project(table)
+
+    async def claim(self, number, session=None):
+        table = self._by_number.get(number)
+        if table is None or table.get('status') == 'reserved':
+            return False
+        table['status'] = 'reserved'
+        return True
+
+    async def claim_many(self, numbers, claim_id):
+        return {number for number in numbers if await self.claim(number)}
+
+    async def set_status(self, numbers, status):
+        for number in numbers:
+            if number in self._by_number:
+                self._by_number[number]['status'] = status
+
+    async def delete_unreserved(self, table_id, session=None):
+        table = self._by_id.get(table_id)
+        if table is None or table.get('status') == 'reserved':
+            return None
+        del self._by_id[table_id]
+        del self._by_number[table['number']]
+        self._numbers.remove(table['number'])
+        return table
+
+    async def close_gap(self, number, session=None):
+        i = bisect.bisect_right(self._numbers, number)
+        for n in self._numbers[i:]:
+            table = self._by_number.pop(n)
+            table['number'] = n - 1
+            self._by_number[n - 1] = table
+        self._numbers[i:] = [n - 1 for n in self._numbers[i:]]
+
+
+class MemoryOrderRepository:
+    def __init__(self):
+        self._by_id = {}
+        self._created = SortedIndex()
+        self._updated = SortedIndex()
+        self._by_status = {}
+
+    def _index(self, order):
+        self._created.add(order['createdAt'], order['id'])
+        if order.get('updatedAt'):
+            self._updated.add(order['updatedAt'], order['id'])
+        self._by_status.setdefault(order['status'], set()).add(order['id'])
+
+    def _unindex(self, order):
+        self._created.remove(order['createdAt'], order['id'])
+        if order.get('updatedAt'):
+            self._updated.remove(order['updatedAt'], order['id'])
+        self._by_status.get(order['status'], set()).discard(order['id'])
+
+    def _update(self, order, fields):
+        self._unindex(order)
+        order.update(fields)
+        self._index(order)
+
+    async def insert(self, order, session=None):
+        if order['id'] in self._by_id:
+            raise DuplicateKeyError(f"duplicate order {order['id']}")
+        order = project(order)
+        self._by_id[order['id']] = order
+        self._index(order)
+
+    async def insert_many(self, orders):
+        failed = {}
+        for n, order in enumerate(orders):
+            try:
+                await self.insert(order)
+            except DuplicateKeyError as e:
+                failed[n] = str(e)
+        return failed
+
+    async def get(self, order_id):
+        return project(self._by_id.get(order_id))
+
+    async def delete(self, order_id):
+        order = self._by_id.pop(order_id, None)
+        if order is None:
+            return False
+        self._unindex(order)
+        return True
+
+    async def count(self):
+        return len(self._by_id)
+
+    async def processing(self, order_ids=None):
+        ids = self._by_status.get('processing', set())
+        if order_ids is not None:
+            ids = ids.intersection(order_ids)
+        return [project(self._by_id[i]) for i in ids]
+
+    async def set_status(self, order_id, status, updated_at):
+        order = self._by_id.get(order_id)
+        if order is None:
+            return None
+        before = project(order)
+        self._update(order, {'status': status, 'updatedAt': updated_at})
+        return before
+
+    async def finish_processing(self, order_ids, updated_at):
+        processing = self._by_status.get('processing', set()).intersection(order_ids)
+        for order_id in processing:
+            self._update(self._by_id[order_id], {'status': 'done', 'remainingTime': 0, 'updatedAt': updated_at})
+        return len(processing)
+
+    async def close_table_gap(self, number, updated_at, session=None):
+        for order_id in list(self._by_status.get('processing', ())):
+            order = self._by_id[order_id]
+            if order['type'] == 'dinein' and (order.get('tableNumber') or 0) > number:
+                self._update(order, {'tableNumber': order['tableNumber'] - 1, 'updatedAt': updated_at})
+
+    async def page(self, status=None, type=None, after=None, limit=1000):
+        orders = []
+        for order_id in self._created.descending(tuple(after) if after else None):
+            order = self._by_id[order_id]
+            if (status and order['status'] != status) or (type and order['type'] != type):
+                continue
+            orders.append(project(order))
+            if len(orders) == limit:
+                break
+        return orders
+
+    async def changed_since(self, updated_at, type=None, limit=1000, after=None):
+        orders = []
+        ids = self._updated.following(updated_at, after) if after else self._updated.ascending(low=updated_at)
+        for order_id in ids:
+            order = self._by_id[order_id]
+            if type and order['type'] != type:
+                continue
+            orders.append(project(order))
+            if len(orders) == limit:
+                break
+        return orders
+
+    async def scan(self, start=None, end=None, batch_size=1000):
+        for order_id in list(self._created.ascending(start, end)):
+            if order_id in self._by_id:
+                yield project(self._by_id[order_id])
+
+    async def summarize(self, start=None, end=None):
+        totals = {'_id': None, 'totalRevenue': 0, 'totalOrders': 0, 'served': 0}
+        by_type, by_day, by_chef = {}, {}, {}
+        for order_id in self._created.ascending(start, end):
+            order = self._by_id[order_id]
+            totals['totalRevenue'] += order['grandTotal']
+            totals['totalOrders'] += 1
+            totals['served'] += order['status'] in analytics.SERVED_STATUSES
+            by_type[order['type']] = by_type.get(order['type'], 0) + 1
+            day = datetime.fromisoformat(order['createdAt'][:10]).isoweekday()
+            by_day[day] = by_day.get(day, 0) + order['grandTotal']
+            if order.get('assignedChef') is not None:
+                by_chef[order['assignedChef']] = by_chef.get(order['assignedChef'], 0) + 1
+        return {
+            'totals': [totals] if totals['totalOrders'] else [],
+            'ordersByType': [{'_id': t, 'count': n} for t, n in by_type.items()],
+            'revenueByDay': [{'_id': d, 'revenue': r} for d, r in by_day.items()],
+            'chefOrderDistribution': [{'_id': c, 'orders': n} for c, n in by_chef.items()],
+        }
+
+
+class MemoryCustomerRepository:
+    def __init__(self):
+        self._by_phone = {}
+        self._phones = []
+
+    async def record_orders(self, customers, session=None):
+        for c in customers:
+            customer = self._by_phone.get(c['phone'])
+            if customer is None:
+                customer = {'phone': c['phone'], 'id': c['id'], 'name': c['name'], 'address': c['address'], 'ordersCount': 0}
+                self._by_phone[c['phone']] = customer
+                bisect.insort(self._phones, c['phone'])
+            customer['ordersCount'] += c['orders']
+
+    async def get(self, phone):
+        return project(self._by_phone.get(phone))
+
+    async def page(self, after=None, limit=1000):
+        i = bisect.bisect_right(self._phones, after) if after else 0
+        return [project(self._by_phone[p]) for p in self._phones[i:i + limit]]
+
+    async def count(self):
+        return len(self._by_phone)
+
+
+class MemoryChefRepository:
+    def __init__(self):
+        self._by_id = {}
+
+    async def insert(self, chef):
+        if chef['id'] in self._by_id:
+            raise DuplicateKeyError(f"duplicate chef {chef['id']}")
+        self._by_id[chef['id']] = project(chef)
+
+    async def all(self):
+        return [project(chef) for chef in self._by_id.values()]
+
+    async def update(self, chef_id, fields):
+        chef = self._by_id.get(chef_id)
+        if chef is None:
+            return None
+        chef.update(fields)
+        return project(chef)
+
+    async def delete(self, chef_id):
+        return self._by_id.pop(chef_id, None) is not None
+
+    async def assign_least_loaded(self):
+        if not self._by_id:
+            return None
+        chef = min(self._by_id.values(), key=lambda c: c['currentOrders'])
+        chef['currentOrders'] += 1
+        return project(chef)
+
+    async def add_orders(self, increments):
+        for chef_id, n in increments.items():
+            if chef_id in self._by_id:
+                self._by_id[chef_id]['currentOrders'] += n
+
+    async def release(self, name):
+        for chef in self._by_id.values():
+            if chef['name'] == name:
+                chef['currentOrders'] -= 1
+                return
+
+
+class MemoryReservationRepository:
+    def __init__(self):
+        self._by_id = {}
+        self._by_table = {}
+
+    async def insert(self, reservation):
+        if reservation['id'] in self._by_id:
+            raise DuplicateKeyError(f"duplicate reservation {reservation['id']}")
+        reservation = project(reservation)
+        self._by_id[reservation['id']] = reservation
+        bisect.insort(self._by_table.setdefault(reservation['tableId'], []), (reservation['start'], reservation['id']))
+
+    async def overlaps(self, table_id, start, end):
+        entries = self._by_table.get(table_id, [])
+        i = bisect.bisect_left(entries, (end,))
+        return any(self._by_id[reservation_id]['end'] > start for _, reservation_id in entries[:i])
+
+    async def ending_after(self, end):
+        return [project(r) for r in self._by_id.values() if r['end'] > end]
+
+    async def overlapping(self, start=None, end=None, table_id=None):
+        return [
+            project(r) for r in self._by_id.values()
+            if (table_id is None or r['tableId'] == table_id)
+            and (start is None or r['end'] > start) and (end is None or r['start'] < end)
+        ]
+
+    async def delete(self, reservation_id):
+        reservation = self._by_id.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        self._by_table[reservation['tableId']].remove((reservation['start'], reservation_id))
+        return True
+
+    async def delete_for_table(self, table_id, session=None):
+        for _, reservation_id in self._by_table.pop(table_id, []):
+            self._by_id.pop(reservation_id, None)
+
+
+class MemoryCounterRepository:
+    def __init__(self):
+        self._values = {}
+
+    async def raise_to(self, name, value):
+        self._values[name] = max(self._values.get(name, value), value)
+
+    async def increment(self, name, count):
+        self._values[name] = self._values.get(name, 0) + count
+        return self._values[name]
+
+
+class MemoryAnalyticsRepository:
+    def __init__(self):
+        self._docs = {}
+
+    async def increment(self, increments):
+        for key, inc in increments:
+            doc = self._docs.setdefault(key, {'_id': key})
+            for path, value in inc.items():
+                *parents, field = path.split('.')
+                target = doc
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[field] = target.get(field, 0) + value
+
+    async def get(self, key):
+        return project(self._docs.get(key))
+
+    async def get_many(self, keys):
+        return [project(self._docs[k]) for k in keys if k in self._docs]
+
+    async def replace_all(self, docs):
+        self._docs = {d['_id']: project(d) for d in docs}
+
+
+class MemoryStore:
+    """Repositories kept in process memory, for tests and benchmarks.
+
+    Each repository holds documents in dicts keyed the way the Mongo unique
+    indexes are, plus sorted indexes for the range scans the handlers run.
+    Reads return shallow copies, so callers can set fields on what they get
+    back just as they can with Motor. Nothing is persisted and there are no transactions;
+    every operation completes without yielding to the event loop, which
+    makes each one atomic.
+    """
+
+    transactions = False
+
+    def __init__(self):
+        self.menu = MemoryMenuRepository()
+        self.tables = MemoryTableRepository()
+        self.orders = MemoryOrderRepository()
+        self.customers = MemoryCustomerRepository()
+        self.chefs = MemoryChefRepository()
+        self.reservations = MemoryReservationRepository()
+        self.counters = MemoryCounterRepository()
+        self.analytics = MemoryAnalyticsRepository()
+
+    async def start(self):
+        pass
+
+    async def run_in_transaction(self, callback):
+        return await callback(None)
+
+    def close(self):
+        pass
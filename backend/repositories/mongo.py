@@ -0,0 +1,350 @@
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+import analytics
+import indexes
+
+
+logger = logging.getLogger(__name__)
+
+
+class MongoMenuRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert(self, item):
+        await self.collection.insert_one(dict(item))
+
+    async def all(self):
+        return await self.collection.find({}, {'_id': 0}).to_list(None)
+
+    async def get_many(self, item_ids, fields=None):
+        projection = {'_id': 0, **{f: 1 for f in fields}} if fields else {'_id': 0}
+        return await self.collection.find({'id': {'$in': list(item_ids)}}, projection).to_list(None)
+
+    async def update(self, item_id, fields):
+        return await self.collection.find_one_and_update(
+            {'id': item_id}, {'$set': fields}, {'_id': 0}, return_document=ReturnDocument.AFTER
+        )
+
+    async def delete(self, item_id):
+        return (await self.collection.delete_one({'id': item_id})).deleted_count > 0
+
+
+class MongoTableRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert(self, table):
+        await self.collection.insert_one(dict(table))
+
+    async def all(self):
+        return await self.collection.find({}, {'_id': 0}).sort('number', 1).to_list(None)
+
+    async def get(self, table_id, session=None):
+        return await self.collection.find_one({'id': table_id}, {'_id': 0}, session=session)
+
+    async def get_by_numbers(self, numbers):
+        return await self.collection.find({'number': {'$in': list(numbers)}}, {'_id': 0}).to_list(None)
+
+    async def last_number(self):
+        last = await self.collection.find_one({}, {'_id': 0, 'number': 1}, sort=[('number', -1)])
+        return last['number'] if last else 0
+
+    async def update(self, table_id, fields):
+        return await self.collection.find_one_and_update(
+            {'id': table_id}, {'$set': fields}, {'_id': 0}, return_document=ReturnDocument.AFTER
+        )
+
+    async def claim(self, number, session=None):
+        result = await self.collection.update_one(
+            {'number': number, 'status': {'$ne': 'reserved'}}, {'$set': {'status': 'reserved'}}, session=session
+        )
+        return result.matched_count > 0
+
+    async def claim_many(self, numbers, claim_id):
+        numbers = list(numbers)
+        await self.collection.update_many(
+            {'number': {'$in': numbers}, 'status': {'$ne': 'reserved'}},
+            {'$set': {'status': 'reserved', 'claimedBy': claim_id}}
+        )
+        claimed = await self.collection.find(
+            {'number': {'$in': numbers}, 'claimedBy': claim_id}, {'_id': 0, 'number': 1}
+        ).to_list(None)
+        return {t['number'] for t in claimed}
+
+    async def set_status(self, numbers, status):
+        await self.collection.update_many({'number': {'$in': list(numbers)}}, {'$set': {'status': status}})
+
+    async def delete_unreserved(self, table_id, session=None):
+        return await self.collection.find_one_and_delete(
+            {'id': table_id, 'status': {'$ne': 'reserved'}}, {'_id': 0}, session=session
+        )
+
+    async def close_gap(self, number, session=None):
+        await self.collection.update_many(
+            {'number': {'$gt': number}}, {'$inc': {'number': -1}}, hint=[('number', 1)], session=session
+        )
+
+
+class MongoOrderRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert(self, order, session=None):
+        await self.collection.insert_one(dict(order), session=session)
+
+    async def insert_many(self, orders):
+        try:
+            await self.collection.insert_many([dict(o) for o in orders], ordered=False)
+        except BulkWriteError as e:
+            return {err['index']: err.get('errmsg', 'Write failed') for err in e.details.get('writeErrors', [])}
+        return {}
+
+    async def get(self, order_id):
+        return await self.collection.find_one({'id': order_id}, {'_id': 0})
+
+    async def delete(self, order_id):
+        return (await self.collection.delete_one({'id': order_id})).deleted_count > 0
+
+    async def count(self):
+        return await self.collection.count_documents({})
+
+    async def processing(self, order_ids=None):
+        query = {'status': 'processing'}
+        if order_ids is not None:
+            query['id'] = {'$in': list(order_ids)}
+        return await self.collection.find(query, {'_id': 0}).to_list(None)
+
+    async def set_status(self, order_id, status, updated_at):
+        return await self.collection.find_one_and_update(
+            {'id': order_id}, {'$set': {'status': status, 'updatedAt': updated_at}}, {'_id': 0},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    async def finish_processing(self, order_ids, updated_at):
+        result = await self.collection.update_many(
+            {'id': {'$in': list(order_ids)}, 'status': 'processing'},
+            {'$set': {'status': 'done', 'remainingTime': 0, 'updatedAt': updated_at}}
+        )
+        return result.modified_count
+
+    async def close_table_gap(self, number, updated_at, session=None):
+        await self.collection.update_many(
+            {'status': 'processing', 'type': 'dinein', 'tableNumber': {'$gt': number}},
+            {'$inc': {'tableNumber': -1}, '$set': {'updatedAt': updated_at}},
+            session=session
+        )
+
+    async def page(self, status=None, type=None, after=None, limit=1000):
+        query = {}
+        if status:
+            query['status'] = status
+        if type:
+            query['type'] = type
+        if after:
+            created_at, order_id = after
+            query['$or'] = [{'createdAt': {'$lt': created_at}}, {'createdAt': created_at, 'id': {'$lt': order_id}}]
+        return await self.collection.find(query, {'_id': 0}).sort([('createdAt', -1), ('id', -1)]).to_list(limit)
+
+    async def changed_since(self, updated_at, type=None, limit=1000, after=None):
+        if after:
+            query = {'$or': [{'updatedAt': {'$gt': updated_at}}, {'updatedAt': updated_at, 'id': {'$gt': after}}]}
+        else:
+            query = {'updatedAt': {'$gte': updated_at}}
+        if type:
+            query['type'] = type
+        return await self.collection.find(query, {'_id': 0}).sort([('updatedAt', 1), ('id', 1)]).to_list(limit)
+
+    async def scan(self, start=None, end=None, batch_size=1000):
+        created_at = {}
+        if start:
+            created_at['$gte'] = start
+        if end:
+            created_at['$lt'] = end
+        query = {'createdAt': created_at} if created_at else {}
+        async for order in self.collection.find(query, {'_id': 0}, batch_size=batch_size).sort([('createdAt', 1), ('id', 1)]):
+            yield order
+
+    async def summarize(self, start=None, end=None):
+        return (await self.collection.aggregate(analytics.range_pipeline(start, end)).to_list(1))[0]
+
+
+class MongoCustomerRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def record_orders(self, customers, session=None):
+        updates = [
+            ({'phone': c['phone']}, {
+                '$setOnInsert': {'id': c['id'], 'name': c['name'], 'address': c['address']},
+                '$inc': {'ordersCount': c['orders']},
+            })
+            for c in customers
+        ]
+        if len(updates) == 1:
+            await self.collection.update_one(*updates[0], upsert=True, session=session)
+        elif updates:
+            await self.collection.bulk_write(
+                [UpdateOne(*u, upsert=True) for u in updates], ordered=False, session=session
+            )
+
+    async def get(self, phone):
+        return await self.collection.find_one({'phone': phone}, {'_id': 0})
+
+    async def page(self, after=None, limit=1000):
+        query = {'phone': {'$gt': after}} if after else {}
+        return await self.collection.find(query, {'_id': 0}).sort('phone', 1).to_list(limit)
+
+    async def count(self):
+        return await self.collection.estimated_document_count()
+
+
+class MongoChefRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert(self, chef):
+        await self.collection.insert_one(dict(chef))
+
+    async def all(self):
+        return await self.collection.find({}, {'_id': 0}).to_list(None)
+
+    async def update(self, chef_id, fields):
+        return await self.collection.find_one_and_update(
+            {'id': chef_id}, {'$set': fields}, {'_id': 0}, return_document=ReturnDocument.AFTER
+        )
+
+    async def delete(self, chef_id):
+        return (await self.collection.delete_one({'id': chef_id})).deleted_count > 0
+
+    async def assign_least_loaded(self):
+        return await self.collection.find_one_and_update(
+            {},
+            {'$inc': {'currentOrders': 1}},
+            {'_id': 0},
+            sort=[('currentOrders', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def add_orders(self, increments):
+        if increments:
+            await self.collection.bulk_write(
+                [UpdateOne({'id': chef_id}, {'$inc': {'currentOrders': n}}) for chef_id, n in increments.items()],
+                ordered=False
+            )
+
+    async def release(self, name):
+        await self.collection.update_one({'name': name}, {'$inc': {'currentOrders': -1}})
+
+
+class MongoReservationRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def insert(self, reservation):
+        await self.collection.insert_one(dict(reservation))
+
+    async def overlaps(self, table_id, start, end):
+        query = {'tableId': table_id, 'start': {'$lt': end}, 'end': {'$gt': start}}
+        return await self.collection.find_one(query, {'_id': 1}) is not None
+
+    async def ending_after(self, end):
+        return await self.collection.find({'end': {'$gt': end}}, {'_id': 0}).to_list(None)
+
+    async def overlapping(self, start=None, end=None, table_id=None):
+        query = {}
+        if table_id is not None:
+            query['tableId'] = table_id
+        if start is not None:
+            query['end'] = {'$gt': start}
+        if end is not None:
+            query['start'] = {'$lt': end}
+        return await self.collection.find(query, {'_id': 0}).to_list(None)
+
+    async def delete(self, reservation_id):
+        return (await self.collection.delete_one({'id': reservation_id})).deleted_count > 0
+
+    async def delete_for_table(self, table_id, session=None):
+        await self.collection.delete_many({'tableId': table_id}, session=session)
+
+
+class MongoCounterRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def raise_to(self, name, value):
+        await self.collection.update_one({'_id': name}, {'$max': {'seq': value}}, upsert=True)
+
+    async def increment(self, name, count):
+        doc = await self.collection.find_one_and_update(
+            {'_id': name}, {'$inc': {'seq': count}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return doc['seq']
+
+
+class MongoAnalyticsRepository:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def increment(self, increments):
+        if len(increments) == 1:
+            key, inc = increments[0]
+            await self.collection.update_one({'_id': key}, {'$inc': inc}, upsert=True)
+        elif increments:
+            await self.collection.bulk_write(
+                [UpdateOne({'_id': key}, {'$inc': inc}, upsert=True) for key, inc in increments], ordered=False
+            )
+
+    async def get(self, key):
+        return await self.collection.find_one({'_id': key})
+
+    async def get_many(self, keys):
+        return await self.collection.find({'_id': {'$in': list(keys)}}).to_list(None)
+
+    async def replace_all(self, docs):
+        ops = [ReplaceOne({'_id': d['_id']}, d, upsert=True) for d in docs]
+        ops.append(DeleteMany({'_id': {'$nin': [d['_id'] for d in docs]}}))
+        await self.collection.bulk_write(ops)
+
+
+class MongoStore:
+    """Repositories backed by one MongoDB database.
+
+    ``transactions`` is ``"on"``, ``"off"`` or ``"auto"``; with ``"auto"``,
+    ``start()`` enables multi-document transactions when the server is a
+    replica set member or mongos.
+    """
+
+    def __init__(self, uri, db_name, transactions="auto", **client_options):
+        self.client = AsyncIOMotorClient(uri, **client_options)
+        self.db = self.client.get_database(db_name)
+        self.transactions_mode = transactions
+        self.transactions = transactions == "on"
+        self.menu = MongoMenuRepository(self.db.menu_items)
+        self.tables = MongoTableRepository(self.db.tables)
+        self.orders = MongoOrderRepository(self.db.orders)
+        self.customers = MongoCustomerRepository(self.db.customers)
+        self.chefs = MongoChefRepository(self.db.chefs)
+        self.reservations = MongoReservationRepository(self.db.reservations)
+        self.counters = MongoCounterRepository(self.db.counters)
+        self.analytics = MongoAnalyticsRepository(self.db.analytics)
+
+    async def start(self):
+        if self.transactions_mode == "auto":
+            hello = await self.client.admin.command('hello')
+            self.transactions = 'setName' in hello or hello.get('msg') == 'isdbgrid'
+        logger.info("Multi-document transactions %s", "enabled" if self.transactions else "disabled")
+        await indexes.bootstrap(self.db)
+
+    async def run_in_transaction(self, callback):
+        if not self.transactions:
+            return await callback(None)
+        async with await self.client.start_session() as session:
+            return await session.with_transaction(callback)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,82 @@
+import bisect
+import time
+from datetime import datetime, timezone
+
+from reloading import Reloader
+
+
+def epoch(value):
+    return datetime.fromisoformat(value).timestamp()
+
+
+class ReservationBook:
+    """Per-table booking intervals kept sorted by start time.
+
+    Bookings on one table never overlap, so each table's list is sorted by
+    both start and end and a conflict check is a single bisect. A reload
+    every ``ttl`` seconds picks up bookings taken by other server processes
+    and keeps only those that end within the last ``horizon`` seconds;
+    ``covers()`` tells whether a window starts late enough to be answered
+    from memory.
+    """
+
+    def __init__(self, ttl=30, horizon=86400):
+        self.horizon = horizon
+        self._since = None
+        self._by_table = {}
+        self._by_id = {}
+        self._reloader = Reloader(self._reload, ttl)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def load(self, reservations):
+        self._by_table, self._by_id = {}, {}
+        for reservation in reservations:
+            self.add(reservation)
+
+    def add(self, reservation):
+        entry = (epoch(reservation['start']), epoch(reservation['end']), reservation['id'])
+        bisect.insort(self._by_table.setdefault(reservation['tableId'], []), entry)
+        self._by_id[reservation['id']] = reservation
+
+    def remove(self, reservation_id):
+        reservation = self._by_id.pop(reservation_id, None)
+        if reservation:
+            entries = self._by_table[reservation['tableId']]
+            entries.remove((epoch(reservation['start']), epoch(reservation['end']), reservation_id))
+        return reservation
+
+    def remove_table(self, table_id):
+        for _, _, reservation_id in self._by_table.pop(table_id, []):
+            self._by_id.pop(reservation_id, None)
+
+    def conflict(self, table_id, start, end):
+        entries = self._by_table.get(table_id, [])
+        i = bisect.bisect_left(entries, (end,)) - 1
+        if i >= 0 and entries[i][1] > start:
+            return self._by_id[entries[i][2]]
+        return None
+
+    def overlapping(self, table_id, start, end):
+        entries = self._by_table.get(table_id, [])
+        i = bisect.bisect_right(entries, start, key=lambda e: e[1])
+        found = []
+        while i < len(entries) and entries[i][0] < end:
+            found.append(self._by_id[entries[i][2]])
+            i += 1
+        return found
+
+    def table_ids(self):
+        return list(self._by_table)
+
+    def covers(self, start):
+        return self._since is not None and start is not None and start >= self._since
+
+    async def _reload(self, store):
+        since = time.time() - self.horizon
+        self.load(await store.reservations.ending_after(datetime.fromtimestamp(since, timezone.utc).isoformat()))
+        self._since = since
+
+    async def ensure(self, store):
+        await self._reloader.ensure(store)
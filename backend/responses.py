@@ -0,0 +1,52 @@
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content):
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':'), default=str).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed, compact stdlib json otherwise."""
+
+    def render(self, content):
+        return dumps(content)
+
+
+class Shape:
+    """Projects stored documents onto a response model's top-level fields without validating them.
+
+    Missing fields get the model's defaults and fields the model does not
+    declare are dropped, which is what ``response_model`` would have sent
+    for a document the app wrote itself. Values are not coerced, so a stored
+    ``0`` for a float field is sent as ``0``, which JSON clients read the same.
+    """
+
+    def __init__(self, model):
+        self.defaults = {
+            name: None if field.is_required() else field.get_default(call_default_factory=True)
+            for name, field in model.model_fields.items()
+        }
+
+    def __call__(self, doc):
+        return {name: doc.get(name, default) for name, default in self.defaults.items()}
+
+    def all(self, docs):
+        return [self(doc) for doc in docs]
+
+
+def carried_headers(response):
+    """Headers a handler set on the injected ``Response``, for a response it builds itself."""
+    return {k: v for k, v in response.headers.items() if k != 'content-length'} if response else None
+
+def trusted(content, response=None):
+    """Send ``content`` as is, skipping ``response_model`` validation and ``jsonable_encoder``."""
+    return FastJSONResponse(content, headers=carried_headers(response))
@@ -0,0 +1,105 @@
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 5
+
+
+def order_deadline(order):
+    created_at = datetime.fromisoformat(order['createdAt'])
+    return created_at.timestamp() + order['processingTime']
+
+
+class OrderLifecycleScheduler:
+    """Min-heap of processing-order deadlines, drained by one background task.
+
+    An order is due at ``createdAt + processingTime``. ``schedule`` replaces
+    an order's earlier deadline and superseded heap entries are skipped when
+    they come due; ``cancel`` drops an order that left ``processing`` early.
+    The ``expire`` callback still filters on status, since another process
+    may have moved the order.
+    """
+
+    def __init__(self, expire, batch_size=500):
+        self._expire = expire
+        self._batch_size = batch_size
+        self._heap = []
+        self._deadlines = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def schedule(self, order_id, deadline):
+        if self._deadlines.get(order_id) == deadline:
+            return
+        self._deadlines[order_id] = deadline
+        if len(self._heap) > 2 * len(self._deadlines) + self._batch_size:
+            self._heap = [(d, i) for i, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        else:
+            heapq.heappush(self._heap, (deadline, order_id))
+        if self._heap[0][1] == order_id:
+            self._wakeup.set()
+
+    def schedule_order(self, order):
+        self.schedule(order['id'], order_deadline(order))
+
+    def cancel(self, order_id):
+        self._deadlines.pop(order_id, None)
+
+    def rebuild(self, orders):
+        self._deadlines = {o['id']: order_deadline(o) for o in orders}
+        self._heap = [(d, i) for i, d in self._deadlines.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def start(self):
+        if self._task is None:
+            # A fresh event for this loop; the app may be started again on a new loop, as tests do.
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self._batch_size:
+            deadline, order_id = heapq.heappop(self._heap)
+            if self._deadlines.get(order_id) == deadline:
+                del self._deadlines[order_id]
+                due.append(order_id)
+        return due
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            due = self._pop_due(now)
+            if due:
+                try:
+                    await self._expire(due)
+                except Exception:
+                    logger.exception("Failed to expire %d orders, retrying in %ss", len(due), RETRY_DELAY)
+                    for order_id in due:
+                        self.schedule(order_id, now + RETRY_DELAY)
+                    await asyncio.sleep(RETRY_DELAY)
+                continue
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -20,6 +20,8 @@ async def seed_database():
     await db.orders.delete_many({})
     await db.customers.delete_many({})
     await db.chefs.delete_many({})
+    await db.analytics.delete_many({})
+    await db.counters.delete_many({})
     print("Cleared existing data")
     
     
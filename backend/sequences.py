@@ -0,0 +1,43 @@
+import asyncio
+
+
+class Sequence:
+    """Monotonic counter kept in the ``counters`` repository.
+
+    With ``block_size > 1`` the process reserves numbers in blocks and hands
+    them out locally, so most allocations need no round trip. Numbers stay
+    unique across processes but are only monotonic within one process, and a
+    restart leaves the unused tail of the block as a gap.
+    """
+
+    def __init__(self, name, start=1, block_size=1):
+        self.name = name
+        self.start = start
+        self.block_size = max(1, block_size)
+        self._next = self._end = 0
+        self._lock = asyncio.Lock()
+
+    async def ensure_at_least(self, store, issued):
+        await store.counters.raise_to(self.name, issued)
+
+    async def _reserve(self, store, count):
+        return await store.counters.increment(self.name, count) - count + self.start
+
+    async def allocate(self, store, count):
+        if self.block_size == 1:
+            first = await self._reserve(store, count)
+            return list(range(first, first + count))
+        values = []
+        async with self._lock:
+            while len(values) < count:
+                if self._next >= self._end:
+                    size = max(count - len(values), self.block_size)
+                    self._next = await self._reserve(store, size)
+                    self._end = self._next + size
+                take = min(count - len(values), self._end - self._next)
+                values.extend(range(self._next, self._next + take))
+                self._next += take
+        return values
+
+    async def next(self, store):
+        return (await self.allocate(store, 1))[0]
@@ -1,38 +1,85 @@
 
 import os
+import asyncio
+import base64
+import csv
+import io
+import json
+import zlib
 import logging
+import heapq
 import random
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Union
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel, Field
+from pymongo.errors import DuplicateKeyError
+
+import analytics
+from assets import StaticAssets
+from availability import TableAvailabilityIndex
+from budget import CommandTimer, RoundTripBudget, instrument
+from catalog import MenuCatalog
+from customers import CustomerDirectory
+from events import OrderEventHub
+from kitchen import KitchenQueue
+from metrics import CONTENT_TYPE, CommandMetrics, Gauge, Registry, RequestMetrics
+from repositories import open_store
+from reservations import ReservationBook, epoch
+from responses import FastJSONResponse, Shape, carried_headers, dumps, trusted
+from scheduler import OrderLifecycleScheduler
+from sequences import Sequence
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / ".env")
 
 
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo").lower()
 MONGO_URI = os.getenv("MONGO_URI") or os.getenv("MONGO_URL")
-if not MONGO_URI:
-    raise RuntimeError(
-        "Missing MongoDB connection string. Set MONGO_URI or MONGO_URL environment variable."
-    )
-
 DB_NAME = os.getenv("DB_NAME", "restaurant")
+ORDER_NUMBER_BLOCK_SIZE = int(os.getenv("ORDER_NUMBER_BLOCK_SIZE", "1"))
+MENU_CACHE_TTL = float(os.getenv("MENU_CACHE_TTL", "30"))
+CUSTOMER_CACHE_SIZE = int(os.getenv("CUSTOMER_CACHE_SIZE", "10000"))
+CUSTOMER_CACHE_TTL = float(os.getenv("CUSTOMER_CACHE_TTL", "30"))
+TABLE_INDEX_TTL = float(os.getenv("TABLE_INDEX_TTL", "30"))
+MAX_ORDER_BATCH = int(os.getenv("MAX_ORDER_BATCH", "500"))
+MONGO_TRANSACTIONS = os.getenv("MONGO_TRANSACTIONS", "auto").lower()
+DB_ROUND_TRIP_BUDGET = int(os.getenv("DB_ROUND_TRIP_BUDGET", "10"))
+DB_REPEAT_LIMIT = int(os.getenv("DB_REPEAT_LIMIT", "3"))
+DB_BUDGET_MODE = os.getenv("DB_BUDGET_MODE", "log").lower()
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "false").lower() in ("1", "true", "yes")
+ORDER_CHANGES_LIMIT = 1000
+MAX_PAGE_SIZE = 1000
+TABLE_NUMBER_ATTEMPTS = 5
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    'id', 'orderNumber', 'createdAt', 'updatedAt', 'type', 'status', 'tableNumber', 'customerName',
+    'customerPhone', 'customerAddress', 'totalAmount', 'taxes', 'deliveryCharge', 'grandTotal',
+    'processingTime', 'assignedChef', 'items'
+]
+ORDER_CHANGES_OVERLAP = timedelta(seconds=2)
+
+
+metrics_registry = Registry()
+store = open_store(
+    STORAGE_BACKEND, MONGO_URI, DB_NAME, MONGO_TRANSACTIONS,
+    event_listeners=[CommandMetrics(metrics_registry), CommandTimer()]
+)
+if STORAGE_BACKEND == 'memory':
+    instrument(store)
+table_renumber_lock = asyncio.Lock()
 
 
-client = AsyncIOMotorClient(MONGO_URI)
-db = client.get_database(DB_NAME)
-
-
-app = FastAPI(title="Restaurant Management API")
+app = FastAPI(
+    title="Restaurant Management API",
+    default_response_class=FastJSONResponse if FAST_RESPONSES else JSONResponse
+)
 api_router = APIRouter(prefix="/api")
 
 
@@ -49,12 +96,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Orders-Cursor", "X-Next-Cursor"],
 )
+app.add_middleware(
+    RoundTripBudget, limit=DB_ROUND_TRIP_BUDGET, repeat_limit=DB_REPEAT_LIMIT, mode=DB_BUDGET_MODE
+)
+app.add_middleware(RequestMetrics, registry=metrics_registry)
 
 static_dir = os.path.join(ROOT_DIR, "static")
-if os.path.isdir(static_dir):
-    
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+static_assets = StaticAssets(static_dir)
 
 class MenuItem(BaseModel):
     id: str
@@ -87,6 +137,24 @@ class TableCreate(BaseModel):
     chairCount: int
     name: Optional[str] = None
 
+class Reservation(BaseModel):
+    id: str
+    tableId: str
+    start: str
+    end: str
+    partySize: int
+    customerName: str
+    customerPhone: str
+    createdAt: str
+
+class ReservationCreate(BaseModel):
+    tableId: str
+    start: str
+    end: str
+    partySize: int = Field(1, ge=1)
+    customerName: str
+    customerPhone: str
+
 class OrderItem(BaseModel):
     menuItemId: str
     menuItemName: str
@@ -111,6 +179,7 @@ class Order(BaseModel):
     processingTime: int
     remainingTime: int
     createdAt: str
+    updatedAt: Optional[str] = None
     assignedChef: Optional[str] = None
 
 class OrderCreate(BaseModel):
@@ -122,6 +191,17 @@ class OrderCreate(BaseModel):
     type: str
     cookingInstructions: Optional[str] = None
 
+class OrderChanges(BaseModel):
+    orders: List[Order]
+    removed: List[str]
+    cursor: str
+
+class OrderBatchResult(BaseModel):
+    index: int
+    ok: bool
+    order: Optional[Order] = None
+    error: Optional[str] = None
+
 class Customer(BaseModel):
     id: str
     name: str
@@ -137,6 +217,27 @@ class Chef(BaseModel):
 class ChefCreate(BaseModel):
     name: str
 
+class KitchenOrder(BaseModel):
+    id: str
+    orderNumber: str
+    type: str
+    tableNumber: Optional[int] = None
+    createdAt: str
+    processingTime: int
+    position: int
+    startsAt: str
+    readyAt: str
+
+class ChefWorkList(BaseModel):
+    chef: Optional[str] = None
+    queuedSeconds: int
+    readyAt: str
+    orders: List[KitchenOrder]
+
+class KitchenQueueView(BaseModel):
+    version: int
+    chefs: List[ChefWorkList]
+
 class Analytics(BaseModel):
     totalChefs: int
     totalRevenue: float
@@ -147,54 +248,125 @@ class Analytics(BaseModel):
     chefOrderDistribution: List[dict]
 
 
+menu_shape = Shape(MenuItem)
+table_shape = Shape(Table)
+order_shape = Shape(Order)
+
+
+order_numbers = Sequence('orderNumber', start=108, block_size=ORDER_NUMBER_BLOCK_SIZE)
+
 async def get_next_order_number():
-    count = await db.orders.count_documents({})
-    return f"{count + 108}"
+    return f"{await order_numbers.next(store)}"
 
 async def get_next_table_number():
-    tables = await db.tables.find({}).to_list(1000)
-    if not tables:
-        return 1
-    numbers = [t['number'] for t in tables]
-    return max(numbers) + 1
+    return await store.tables.last_number() + 1
 
 async def assign_chef_to_order():
-    chefs = await db.chefs.find({}).to_list(1000)
+    chef = await store.chefs.assign_least_loaded()
+    return chef['name'] if chef else None
+
+async def assign_chefs_to_orders(count):
+    chefs = await store.chefs.all()
     if not chefs:
-        return None
-    chefs_sorted = sorted(chefs, key=lambda x: x['currentOrders'])
-    min_orders = chefs_sorted[0]['currentOrders']
-    available_chefs = [c for c in chefs_sorted if c['currentOrders'] == min_orders]
-    selected_chef = random.choice(available_chefs)
-    await db.chefs.update_one({'id': selected_chef['id']}, {'$inc': {'currentOrders': 1}})
-    return selected_chef['name']
+        return [(None, None)] * count
+    heap = [(c['currentOrders'], random.random(), c['id'], c['name']) for c in chefs]
+    heapq.heapify(heap)
+    assigned = []
+    for _ in range(count):
+        current, tiebreak, chef_id, name = heapq.heappop(heap)
+        assigned.append((chef_id, name))
+        heapq.heappush(heap, (current + 1, tiebreak, chef_id, name))
+    return assigned
+
+def with_remaining_time(order, now=None):
+    if order['status'] == 'processing':
+        now = now if now is not None else datetime.now(timezone.utc)
+        created_at = datetime.fromisoformat(order['createdAt'])
+        elapsed = (now - created_at).total_seconds()
+        order['remainingTime'] = max(0, order['processingTime'] - int(elapsed))
+    else:
+        order['remainingTime'] = 0
+    return order
+
+order_events = OrderEventHub()
+table_availability = TableAvailabilityIndex(ttl=TABLE_INDEX_TTL)
+reservation_book = ReservationBook(ttl=TABLE_INDEX_TTL)
+reservation_lock = asyncio.Lock()
+
+async def expire_orders(order_ids):
+    expired = await store.orders.processing(order_ids)
+    if not expired:
+        return
+    served = await store.orders.finish_processing([o['id'] for o in expired], datetime.now(timezone.utc).isoformat())
+    await analytics.record_served(store, served)
+    for o in expired:
+        kitchen_queue.remove(o['id'])
+        order_events.publish('status', {'id': o['id'], 'status': 'done', 'remainingTime': 0})
+    table_numbers = [o['tableNumber'] for o in expired if o.get('type') == 'dinein' and o.get('tableNumber')]
+    if table_numbers:
+        await store.tables.set_status(table_numbers, 'available')
+        for number in table_numbers:
+            table_availability.set_status(number=number, status='available')
+
+order_scheduler = OrderLifecycleScheduler(expire_orders)
+kitchen_queue = KitchenQueue()
+
+menu_catalog = MenuCatalog(ttl=MENU_CACHE_TTL)
+customer_directory = CustomerDirectory(capacity=CUSTOMER_CACHE_SIZE, ttl=CUSTOMER_CACHE_TTL)
+
+async def lookup_menu_items(item_ids):
+    item_ids = set(item_ids)
+    found = await menu_catalog.get_many(store, item_ids)
+    missing = item_ids - found.keys()
+    if missing:
+        fetched = await store.menu.get_many(missing, ('id', 'averagePreparationTime', 'price'))
+        if fetched:
+            menu_catalog.invalidate()
+        found.update({item['id']: item for item in fetched})
+    return found
 
 async def calculate_order_timing(items):
-    total_time = 0
-    for item in items:
-        menu_item = await db.menu_items.find_one({'id': item['menuItemId']})
-        if menu_item:
-            total_time += menu_item['averagePreparationTime'] * item['quantity']
+    menu_items = await lookup_menu_items(item['menuItemId'] for item in items)
+    unknown = sorted({item['menuItemId'] for item in items} - menu_items.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown menu items: {', '.join(unknown)}")
+    total_time = sum(menu_items[item['menuItemId']]['averagePreparationTime'] * item['quantity'] for item in items)
     return total_time * 60
 
+def not_modified(request: Request, response: Response, etag: str):
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    response.headers.update(headers)
+    if_none_match = [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]
+    if etag in if_none_match or '*' in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return None
+
 
 @api_router.post("/menu", response_model=MenuItem)
 async def create_menu_item(item: MenuItemCreate):
     item_id = f"menu_{datetime.now().timestamp()}"
     item_dict = item.model_dump()
     item_dict['id'] = item_id
-    await db.menu_items.insert_one(item_dict)
-    return MenuItem(**item_dict)
+    await store.menu.insert(item_dict)
+    menu_catalog.invalidate()
+    return item_dict
 
 @api_router.get("/menu", response_model=List[MenuItem])
-async def get_menu_items(category: Optional[str] = None):
-    query = {} if not category else {'category': category}
-    items = await db.menu_items.find(query, {'_id': 0}).to_list(1000)
-    return items
+async def get_menu_items(request: Request, response: Response, category: Optional[str] = None):
+    cached = not_modified(request, response, await menu_catalog.etag(store))
+    if cached:
+        return cached
+    if FAST_RESPONSES:
+        body = await menu_catalog.encoded(store, category, lambda items: dumps(menu_shape.all(items)))
+        return Response(body, media_type="application/json", headers=carried_headers(response))
+    return await menu_catalog.items(store, category)
 
 @api_router.get("/menu/{item_id}", response_model=MenuItem)
-async def get_menu_item(item_id: str):
-    item = await db.menu_items.find_one({'id': item_id}, {'_id': 0})
+async def get_menu_item(item_id: str, request: Request, response: Response):
+    cached = not_modified(request, response, await menu_catalog.etag(store))
+    if cached:
+        return cached
+    item = await menu_catalog.get(store, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Menu item not found")
     return item
@@ -202,104 +374,114 @@ async def get_menu_item(item_id: str):
 @api_router.put("/menu/{item_id}", response_model=MenuItem)
 async def update_menu_item(item_id: str, item: MenuItemCreate):
     item_dict = item.model_dump()
-    result = await db.menu_items.update_one({'id': item_id}, {'$set': item_dict})
-    if result.matched_count == 0:
+    updated_item = await store.menu.update(item_id, item_dict)
+    if not updated_item:
         raise HTTPException(status_code=404, detail="Menu item not found")
-    updated_item = await db.menu_items.find_one({'id': item_id}, {'_id': 0})
-    return MenuItem(**updated_item)
+    menu_catalog.invalidate()
+    return updated_item
 
 @api_router.delete("/menu/{item_id}")
 async def delete_menu_item(item_id: str):
-    result = await db.menu_items.delete_one({'id': item_id})
-    if result.deleted_count == 0:
+    if not await store.menu.delete(item_id):
         raise HTTPException(status_code=404, detail="Menu item not found")
+    menu_catalog.invalidate()
     return {"message": "Menu item deleted successfully"}
 
 @api_router.get("/menu/categories/list")
-async def get_categories():
-    categories = await db.menu_items.distinct('category')
-    return {"categories": categories}
+async def get_categories(request: Request, response: Response):
+    cached = not_modified(request, response, await menu_catalog.etag(store))
+    if cached:
+        return cached
+    return {"categories": await menu_catalog.categories(store)}
 
 @api_router.post("/tables", response_model=Table)
 async def create_table(table: TableCreate):
-    table_number = await get_next_table_number()
-    table_id = f"table_{table_number}"
-    table_dict = table.model_dump()
-    table_dict['id'] = table_id
-    table_dict['number'] = table_number
-    table_dict['status'] = 'available'
-    await db.tables.insert_one(table_dict)
-    return Table(**table_dict)
+    for _ in range(TABLE_NUMBER_ATTEMPTS):
+        table_dict = table.model_dump()
+        table_dict['id'] = f"table_{datetime.now().timestamp()}"
+        table_dict['number'] = await get_next_table_number()
+        table_dict['status'] = 'available'
+        try:
+            await store.tables.insert(table_dict)
+        except DuplicateKeyError:
+            continue
+        table_availability.upsert(table_dict)
+        return table_dict
+    raise HTTPException(status_code=409, detail="Could not allocate a table number, try again")
 
 @api_router.get("/tables", response_model=List[Table])
 async def get_tables():
-    tables = await db.tables.find({}, {'_id': 0}).sort('number', 1).to_list(1000)
-    return tables
+    tables = await store.tables.all()
+    return trusted(table_shape.all(tables)) if FAST_RESPONSES else tables
+
+@api_router.get("/tables/available", response_model=Table)
+async def get_available_table(party: int = Query(..., ge=1)):
+    table = await table_availability.best_fit(store, party)
+    if not table:
+        raise HTTPException(status_code=404, detail="No available table for this party size")
+    return table
+
+def parse_window(start, end):
+    start, end = parse_time_bound(start, "start"), parse_time_bound(end, "end")
+    if not start or not end or end <= start:
+        raise HTTPException(status_code=400, detail="A time window needs a start before its end")
+    return start, end
+
+@api_router.get("/tables/free", response_model=List[Table])
+async def get_free_tables(start: str, end: str, party: int = Query(1, ge=1)):
+    start, end = parse_window(start, end)
+    tables, _ = await asyncio.gather(table_availability.all_tables(store), reservation_book.ensure(store))
+    window = (epoch(start), epoch(end))
+    free = [t for t in tables if t['chairCount'] >= party and not reservation_book.conflict(t['id'], *window)]
+    return sorted(free, key=lambda t: (t['chairCount'], t['number']))
 
 @api_router.get("/tables/{table_id}", response_model=Table)
 async def get_table(table_id: str):
-    table = await db.tables.find_one({'id': table_id}, {'_id': 0})
+    table = await store.tables.get(table_id)
     if not table:
         raise HTTPException(status_code=404, detail="Table not found")
     return table
 
-@api_router.put("/tables/{table_id}/status")
+@api_router.put("/tables/{table_id}/status", response_model=Table)
 async def update_table_status(table_id: str, status: str, customer_id: Optional[str] = None):
     update_data = {'status': status}
     if customer_id:
         update_data['customerId'] = customer_id
     elif status == 'available':
         update_data['customerId'] = None
-    result = await db.tables.update_one({'id': table_id}, {'$set': update_data})
-    if result.matched_count == 0:
+    updated_table = await store.tables.update(table_id, update_data)
+    if not updated_table:
         raise HTTPException(status_code=404, detail="Table not found")
-    updated_table = await db.tables.find_one({'id': table_id}, {'_id': 0})
-    return Table(**updated_table)
+    table_availability.upsert(updated_table)
+    return updated_table
 
-@api_router.delete("/tables/{table_id}")
-async def delete_table(table_id: str):
-    table = await db.tables.find_one({'id': table_id})
+async def remove_and_renumber_table(table_id, session=None):
+    table = await store.tables.delete_unreserved(table_id, session)
     if not table:
+        if await store.tables.get(table_id, session):
+            raise HTTPException(status_code=400, detail="Cannot delete reserved table")
         raise HTTPException(status_code=404, detail="Table not found")
-    if table['status'] == 'reserved':
-        raise HTTPException(status_code=400, detail="Cannot delete reserved table")
-    table_number = table['number']
-    await db.tables.delete_one({'id': table_id})
-    tables = await db.tables.find({'number': {'$gt': table_number}}).sort('number', 1).to_list(1000)
-    for t in tables:
-        await db.tables.update_one({'id': t['id']}, {'$set': {'number': t['number'] - 1}})
+    await store.tables.close_gap(table['number'], session)
+    await store.orders.close_table_gap(table['number'], datetime.now(timezone.utc).isoformat(), session)
+    await store.reservations.delete_for_table(table_id, session)
+    return table
+
+@api_router.delete("/tables/{table_id}")
+async def delete_table(table_id: str):
+    async with table_renumber_lock:
+        table = await store.run_in_transaction(lambda session: remove_and_renumber_table(table_id, session))
+    kitchen_queue.close_table_gap(table['number'])
+    table_availability.invalidate()
+    reservation_book.remove_table(table_id)
+    order_events.publish('reset', {})
     return {"message": "Table deleted and numbers reshuffled"}
 
-@api_router.post("/orders", response_model=Order)
-async def create_order(order: OrderCreate):
-    if order.type == 'dinein' and order.tableNumber:
-        table = await db.tables.find_one({'number': order.tableNumber})
-        if not table:
-            raise HTTPException(status_code=404, detail="Table not found")
-        if table.get('status') == 'reserved':
-            raise HTTPException(status_code=400, detail="Table reserved!!!")
-    order_number = await get_next_order_number()
-    order_id = f"order_{datetime.now().timestamp()}"
+def build_order(order: OrderCreate, order_id, order_number, processing_time, assigned_chef):
     item_total = sum(item.price * item.quantity for item in order.items)
     taxes = item_total * 0.05
-    delivery_charge = 50 if order.type == 'takeaway' else 0
+    delivery_charge = 50.0 if order.type == 'takeaway' else 0.0
     grand_total = item_total + taxes + delivery_charge
-    processing_time = await calculate_order_timing([item.model_dump() for item in order.items])
-    assigned_chef = await assign_chef_to_order()
-    if order.type == 'dinein' and order.tableNumber:
-        await db.tables.update_one({'number': order.tableNumber}, {'$set': {'status': 'reserved'}})
-    customer = await db.customers.find_one({'phone': order.customerPhone})
-    if customer:
-        await db.customers.update_one({'phone': order.customerPhone}, {'$inc': {'ordersCount': 1}})
-    else:
-        customer_id = f"customer_{datetime.now().timestamp()}"
-        await db.customers.insert_one({
-            'id': customer_id,
-            'name': order.customerName,
-            'phone': order.customerPhone,
-            'address': order.customerAddress,
-            'ordersCount': 1
-        })
+    now = datetime.now(timezone.utc).isoformat()
     order_dict = order.model_dump()
     order_dict.update({
         'id': order_id,
@@ -311,74 +493,390 @@ async def create_order(order: OrderCreate):
         'grandTotal': grand_total,
         'processingTime': processing_time,
         'remainingTime': processing_time,
-        'createdAt': datetime.now(timezone.utc).isoformat(),
+        'createdAt': now,
+        'updatedAt': now,
         'assignedChef': assigned_chef
     })
-    await db.orders.insert_one(order_dict)
-    return Order(**order_dict)
-
-@api_router.get("/orders", response_model=List[Order])
-async def get_orders(status: Optional[str] = None, type: Optional[str] = None):
-    query = {}
-    if status:
-        query['status'] = status
-    if type:
-        query['type'] = type
-    orders = await db.orders.find(query, {'_id': 0}).sort('createdAt', -1).to_list(1000)
+    return order_dict
+
+def customer_record(order_dict, customer_id, orders=1):
+    return {
+        'phone': order_dict['customerPhone'],
+        'id': customer_id,
+        'name': order_dict['customerName'],
+        'address': order_dict['customerAddress'],
+        'orders': orders,
+    }
+
+def upsert_customer(order_dict, session=None):
+    return store.customers.record_orders([customer_record(order_dict, f"customer_{datetime.now().timestamp()}")], session)
+
+async def find_table_status(table_number):
+    if not table_number:
+        return None
+    tables = await store.tables.get_by_numbers([table_number])
+    return tables[0] if tables else None
+
+async def claim_table(table_number, session=None):
+    if not await store.tables.claim(table_number, session):
+        raise HTTPException(status_code=400, detail="Table reserved!!!")
+
+async def release_tables(table_numbers):
+    await store.tables.set_status(table_numbers, 'available')
+    for number in table_numbers:
+        table_availability.set_status(number=number, status='available')
+
+async def write_order(order_dict, session=None):
+    table_number = order_dict['tableNumber'] if order_dict['type'] == 'dinein' else None
+    if session is not None:
+        if table_number:
+            await claim_table(table_number, session)
+        await store.orders.insert(order_dict, session)
+        await upsert_customer(order_dict, session)
+        return
+    if table_number:
+        await claim_table(table_number)
+    inserted = False
+    try:
+        await store.orders.insert(order_dict)
+        inserted = True
+        await upsert_customer(order_dict)
+    except Exception:
+        # An inserted order holds its table until it is deleted again.
+        if inserted:
+            await store.orders.delete(order_dict['id'])
+        if table_number:
+            await release_tables([table_number])
+        raise
+
+@api_router.post("/reservations", response_model=Reservation)
+async def create_reservation(reservation: ReservationCreate):
+    start, end = parse_window(reservation.start, reservation.end)
+    if epoch(end) <= datetime.now(timezone.utc).timestamp():
+        raise HTTPException(status_code=400, detail="Reservation window has already ended")
+    table, _ = await asyncio.gather(store.tables.get(reservation.tableId), reservation_book.ensure(store))
+    if not table:
+        raise HTTPException(status_code=404, detail="Table not found")
+    if reservation.partySize > table['chairCount']:
+        raise HTTPException(status_code=400, detail="Party is larger than the table")
+    async with reservation_lock:
+        if reservation_book.conflict(reservation.tableId, epoch(start), epoch(end)) or \
+                await store.reservations.overlaps(reservation.tableId, start, end):
+            raise HTTPException(status_code=409, detail="Table is already booked for this time")
+        reservation_dict = reservation.model_dump()
+        reservation_dict.update({
+            'id': f"reservation_{datetime.now().timestamp()}",
+            'start': start,
+            'end': end,
+            'createdAt': datetime.now(timezone.utc).isoformat()
+        })
+        await store.reservations.insert(reservation_dict)
+        reservation_book.add(reservation_dict)
+    return reservation_dict
+
+@api_router.get("/reservations", response_model=List[Reservation])
+async def get_reservations(
+    table_id: Optional[str] = Query(None, alias="tableId"),
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to")
+):
+    start, end = parse_time_bound(start, "from"), parse_time_bound(end, "to")
+    await reservation_book.ensure(store)
+    window = (epoch(start) if start else float('-inf'), epoch(end) if end else float('inf'))
+    if reservation_book.covers(window[0]):
+        table_ids = [table_id] if table_id else reservation_book.table_ids()
+        found = [r for t in table_ids for r in reservation_book.overlapping(t, *window)]
+    else:
+        # Bookings that ended before the book's horizon are only in the store
+        found = await store.reservations.overlapping(start, end, table_id)
+    return sorted(found, key=lambda r: (r['start'], r['tableId']))
+
+@api_router.delete("/reservations/{reservation_id}")
+async def delete_reservation(reservation_id: str):
+    if not await store.reservations.delete(reservation_id):
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    reservation_book.remove(reservation_id)
+    return {"message": "Reservation cancelled"}
+
+@api_router.post("/orders", response_model=Order)
+async def create_order(order: OrderCreate):
+    table_number = order.tableNumber if order.type == 'dinein' else None
+    processing_time, table = await asyncio.gather(
+        calculate_order_timing([item.model_dump() for item in order.items]),
+        find_table_status(table_number)
+    )
+    if table_number:
+        if not table:
+            raise HTTPException(status_code=404, detail="Table not found")
+        if table.get('status') == 'reserved':
+            raise HTTPException(status_code=400, detail="Table reserved!!!")
+    order_number, assigned_chef = await asyncio.gather(get_next_order_number(), assign_chef_to_order())
+    order_dict = build_order(order, f"order_{datetime.now().timestamp()}", order_number, processing_time, assigned_chef)
+    try:
+        await store.run_in_transaction(lambda session: write_order(order_dict, session))
+    except Exception:
+        if assigned_chef:
+            await store.chefs.release(assigned_chef)
+        raise
+    finally:
+        customer_directory.invalidate([order_dict['customerPhone']])
+    if order_dict['type'] == 'dinein' and order_dict['tableNumber']:
+        table_availability.set_status(number=order_dict['tableNumber'], status='reserved')
+    await analytics.record_order(store, order_dict)
+    order_scheduler.schedule_order(order_dict)
+    kitchen_queue.add(order_dict)
+    created = Order(**order_dict).model_dump()
+    order_events.publish('created', created)
+    return trusted(created) if FAST_RESPONSES else created
+
+@api_router.post("/orders/batch", response_model=List[OrderBatchResult])
+async def create_orders_batch(orders: List[OrderCreate]):
+    if len(orders) > MAX_ORDER_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_ORDER_BATCH} orders per batch")
+    results = [None] * len(orders)
+    menu_items = await lookup_menu_items(item.menuItemId for order in orders for item in order.items)
+    requested_tables = list({o.tableNumber for o in orders if o.type == 'dinein' and o.tableNumber})
+    tables = {t['number']: t for t in await store.tables.get_by_numbers(requested_tables)}
+    accepted = []
+    claimed_tables = set()
+    for index, order in enumerate(orders):
+        unknown = sorted({item.menuItemId for item in order.items} - menu_items.keys())
+        table_number = order.tableNumber if order.type == 'dinein' else None
+        if unknown:
+            error = f"Unknown menu items: {', '.join(unknown)}"
+        elif table_number and table_number not in tables:
+            error = "Table not found"
+        elif table_number and (tables[table_number].get('status') == 'reserved' or table_number in claimed_tables):
+            error = "Table reserved!!!"
+        else:
+            error = None
+        if error:
+            results[index] = OrderBatchResult(index=index, ok=False, error=error)
+            continue
+        if table_number:
+            claimed_tables.add(table_number)
+        processing_time = sum(menu_items[item.menuItemId]['averagePreparationTime'] * item.quantity for item in order.items) * 60
+        accepted.append((index, order, processing_time))
+    timestamp = datetime.now().timestamp()
+    won = set()
+    if claimed_tables:
+        # Another request may have taken a table since it was read; only tables claimed here are used.
+        won = await store.tables.claim_many(claimed_tables, f"batch_{timestamp}")
+        for index, order, _ in accepted:
+            if order.type == 'dinein' and order.tableNumber and order.tableNumber not in won:
+                results[index] = OrderBatchResult(index=index, ok=False, error="Table reserved!!!")
+        accepted = [a for a in accepted if results[a[0]] is None]
+        for number in won:
+            table_availability.set_status(number=number, status='reserved')
+    if not accepted:
+        return results
+
+    try:
+        numbers, chefs = await asyncio.gather(
+            order_numbers.allocate(store, len(accepted)),
+            assign_chefs_to_orders(len(accepted))
+        )
+        order_dicts = [
+            build_order(order, f"order_{timestamp}_{index}", f"{number}", processing_time, chef)
+            for (index, order, processing_time), number, (_, chef) in zip(accepted, numbers, chefs)
+        ]
+        failed = await store.orders.insert_many(order_dicts)
+    except Exception:
+        if won:
+            await release_tables(won)
+        raise
+    inserted = []
+    increments = {}
+    released_tables = set()
+    for n, ((index, _, _), order_dict, (chef_id, _)) in enumerate(zip(accepted, order_dicts, chefs)):
+        if n in failed:
+            results[index] = OrderBatchResult(index=index, ok=False, error=failed[n])
+            if order_dict['type'] == 'dinein' and order_dict['tableNumber']:
+                released_tables.add(order_dict['tableNumber'])
+            continue
+        inserted.append(order_dict)
+        if chef_id:
+            increments[chef_id] = increments.get(chef_id, 0) + 1
+        order_scheduler.schedule_order(order_dict)
+        kitchen_queue.add(order_dict)
+        results[index] = OrderBatchResult(index=index, ok=True, order=Order(**order_dict))
+        order_events.publish('created', results[index].order.model_dump())
+
+    customers = {}
+    for order_dict in inserted:
+        customer = customers.setdefault(order_dict['customerPhone'], {'order': order_dict, 'count': 0})
+        customer['count'] += 1
+    writes = [analytics.record_orders(store, inserted)]
+    if increments:
+        writes.append(store.chefs.add_orders(increments))
+    if customers:
+        writes.append(store.customers.record_orders([
+            customer_record(c['order'], f"customer_{timestamp}_{n}", c['count']) for n, c in enumerate(customers.values())
+        ]))
+    if released_tables:
+        writes.append(release_tables(released_tables))
+    try:
+        await asyncio.gather(*writes)
+    finally:
+        customer_directory.invalidate(customers)
+    return results
+
+async def get_order_changes(since, status, type, now):
+    # A timestamp cursor rereads ORDER_CHANGES_OVERLAP to catch late writes; a full page hands out an
+    # (updatedAt, id) keyset cursor instead, so a burst larger than one page is still paged through.
+    try:
+        since = parse_time_bound(since, "since")
+    except HTTPException:
+        updated_at, after = decode_cursor(since, 2)
+    else:
+        updated_at, after = (datetime.fromisoformat(since) - ORDER_CHANGES_OVERLAP).isoformat(), None
+    changed = await store.orders.changed_since(updated_at, type, ORDER_CHANGES_LIMIT, after)
+    if len(changed) == ORDER_CHANGES_LIMIT:
+        cursor = encode_cursor(changed[-1]['updatedAt'], changed[-1]['id'])
+    else:
+        cursor = now.isoformat()
+    orders = [with_remaining_time(o, now) for o in changed if not status or o['status'] == status]
+    removed = [o['id'] for o in changed if status and o['status'] != status]
+    if FAST_RESPONSES:
+        return trusted({'orders': order_shape.all(orders), 'removed': removed, 'cursor': cursor})
+    return OrderChanges(orders=orders, removed=removed, cursor=cursor)
+
+def encode_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor, size):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def next_page(response: Response, rows, limit, cursor_fields):
+    if len(rows) > limit:
+        del rows[limit:]
+        response.headers['X-Next-Cursor'] = encode_cursor(*[rows[-1][field] for field in cursor_fields])
+    return rows
+
+@api_router.get("/orders", response_model=Union[List[Order], OrderChanges])
+async def get_orders(
+    response: Response,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    since: Optional[str] = None,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    now = datetime.now(timezone.utc)
+    if since:
+        return await get_order_changes(since, status, type, now)
+    after = decode_cursor(after, 2) if after else None
+    orders = await store.orders.page(status, type, after, limit + 1)
+    next_page(response, orders, limit, ('createdAt', 'id'))
     for order in orders:
-        if order['status'] == 'processing':
-            created_at = datetime.fromisoformat(order['createdAt'])
-            elapsed = (datetime.now(timezone.utc) - created_at).total_seconds()
-            remaining = max(0, order['processingTime'] - int(elapsed))
-            order['remainingTime'] = remaining
-            if remaining == 0:
-                await db.orders.update_one({'id': order['id']}, {'$set': {'status': 'done', 'remainingTime': 0}})
-                order['status'] = 'done'
-                if order.get('type') == 'dinein' and order.get('tableNumber'):
-                    await db.tables.update_one({'number': order['tableNumber']}, {'$set': {'status': 'available'}})
+        with_remaining_time(order, now)
+    response.headers['X-Orders-Cursor'] = now.isoformat()
+    return trusted(order_shape.all(orders), response) if FAST_RESPONSES else orders
+
+async def export_orders_rows(start, end, format):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == 'csv':
+        writer.writerow(EXPORT_FIELDS)
+    rows = 0
+    async for order in store.orders.scan(start, end, EXPORT_BATCH_SIZE):
+        if format == 'csv':
+            writer.writerow([json.dumps(order.get(f)) if f == 'items' else order.get(f) for f in EXPORT_FIELDS])
         else:
-            order['remainingTime'] = 0
-    return orders
+            buffer.write(json.dumps(order, default=str))
+            buffer.write('\n')
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+async def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+@api_router.get("/orders/export")
+async def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    gzip: bool = False
+):
+    start, end = parse_time_bound(start, "from"), parse_time_bound(end, "to")
+    chunks = export_orders_rows(start, end, format)
+    headers = {'Content-Disposition': f'attachment; filename="orders.{format}"'}
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    media_type = 'text/csv' if format == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+@api_router.get("/orders/stream")
+async def stream_orders(last_event_id: Optional[str] = Header(None), resume: Optional[str] = Query(None, alias="lastEventId")):
+    return StreamingResponse(
+        order_events.stream(last_event_id or resume),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @api_router.get("/orders/{order_id}", response_model=Order)
 async def get_order(order_id: str):
-    order = await db.orders.find_one({'id': order_id}, {'_id': 0})
+    order = await store.orders.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    if order['status'] == 'processing':
-        created_at = datetime.fromisoformat(order['createdAt'])
-        elapsed = (datetime.now(timezone.utc) - created_at).total_seconds()
-        remaining = max(0, order['processingTime'] - int(elapsed))
-        order['remainingTime'] = remaining
-        if remaining == 0:
-            await db.orders.update_one({'id': order_id}, {'$set': {'status': 'done', 'remainingTime': 0}})
-            order['status'] = 'done'
-            if order.get('type') == 'dinein' and order.get('tableNumber'):
-                await db.tables.update_one({'number': order['tableNumber']}, {'$set': {'status': 'available'}})
-    return order
+    return with_remaining_time(order)
 
-@api_router.put("/orders/{order_id}/status")
+@api_router.put("/orders/{order_id}/status", response_model=Order)
 async def update_order_status(order_id: str, status: str):
-    order = await db.orders.find_one({'id': order_id})
+    updated_at = datetime.now(timezone.utc).isoformat()
+    order = await store.orders.set_status(order_id, status, updated_at)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    result = await db.orders.update_one({'id': order_id}, {'$set': {'status': status}})
+    await analytics.record_status_change(store, order['status'], status)
+    if status == 'processing':
+        order_scheduler.schedule_order(order)
+        kitchen_queue.add(order)
+    else:
+        kitchen_queue.remove(order_id)
+        order_scheduler.cancel(order_id)
     if status == 'done' and order['type'] == 'dinein' and order.get('tableNumber'):
-        await db.tables.update_one({'number': order['tableNumber']}, {'$set': {'status': 'available'}})
+        await release_tables([order['tableNumber']])
     if status == 'completed':
         if order.get('assignedChef'):
-            await db.chefs.update_one({'name': order['assignedChef']}, {'$inc': {'currentOrders': -1}})
-    updated_order = await db.orders.find_one({'id': order_id}, {'_id': 0})
-    return Order(**updated_order)
+            await store.chefs.release(order['assignedChef'])
+    order_events.publish('status', {'id': order_id, 'status': status})
+    return with_remaining_time({**order, 'status': status, 'updatedAt': updated_at})
+
+@api_router.get("/kitchen/queue", response_model=KitchenQueueView)
+async def get_kitchen_queue(request: Request, response: Response):
+    cached = not_modified(request, response, kitchen_queue.etag)
+    if cached:
+        return cached
+    return trusted(kitchen_queue.view(), response) if FAST_RESPONSES else kitchen_queue.view()
 
 @api_router.get("/customers", response_model=List[Customer])
-async def get_customers():
-    customers = await db.customers.find({}, {'_id': 0}).to_list(1000)
-    return customers
+async def get_customers(
+    response: Response,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    customers = await store.customers.page(decode_cursor(after, 1)[0] if after else None, limit + 1)
+    return next_page(response, customers, limit, ('phone',))
 
 @api_router.get("/customers/{phone}")
 async def get_customer_by_phone(phone: str):
-    customer = await db.customers.find_one({'phone': phone}, {'_id': 0})
+    customer = await customer_directory.get(store, phone)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
@@ -389,82 +887,119 @@ async def create_chef(chef: ChefCreate):
     chef_dict = chef.model_dump()
     chef_dict['id'] = chef_id
     chef_dict['currentOrders'] = 0
-    await db.chefs.insert_one(chef_dict)
-    return Chef(**chef_dict)
+    await store.chefs.insert(chef_dict)
+    return chef_dict
 
 @api_router.get("/chefs", response_model=List[Chef])
 async def get_chefs():
-    chefs = await db.chefs.find({}, {'_id': 0}).to_list(1000)
-    return chefs
+    return await store.chefs.all()
 
 @api_router.put("/chefs/{chef_id}", response_model=Chef)
 async def update_chef(chef_id: str, chef: ChefCreate):
     chef_dict = chef.model_dump()
-    result = await db.chefs.update_one({'id': chef_id}, {'$set': chef_dict})
-    if result.matched_count == 0:
+    updated_chef = await store.chefs.update(chef_id, chef_dict)
+    if not updated_chef:
         raise HTTPException(status_code=404, detail="Chef not found")
-    updated_chef = await db.chefs.find_one({'id': chef_id}, {'_id': 0})
-    return Chef(**updated_chef)
+    return updated_chef
 
 @api_router.delete("/chefs/{chef_id}")
 async def delete_chef(chef_id: str):
-    result = await db.chefs.delete_one({'id': chef_id})
-    if result.deleted_count == 0:
+    if not await store.chefs.delete(chef_id):
         raise HTTPException(status_code=404, detail="Chef not found")
     return {"message": "Chef deleted successfully"}
 
+def parse_time_bound(value, name):
+    if not value:
+        return None
+    try:
+        bound = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid '{name}' timestamp")
+    if bound.tzinfo is None:
+        bound = bound.replace(tzinfo=timezone.utc)
+    return bound.astimezone(timezone.utc).isoformat()
+
 @api_router.get("/analytics", response_model=Analytics)
-async def get_analytics():
-    total_chefs = await db.chefs.count_documents({})
-    orders = await db.orders.find({}, {'_id': 0}).to_list(10000)
-    total_revenue = sum(order['grandTotal'] for order in orders)
-    total_orders = len(orders)
-    total_clients = await db.customers.count_documents({})
-    dinein_orders = len([o for o in orders if o['type'] == 'dinein'])
-    takeaway_orders = len([o for o in orders if o['type'] == 'takeaway'])
-    served_orders = len([o for o in orders if o['status'] == 'done' or o['status'] == 'completed'])
-    orders_by_type = {'dinein': dinein_orders, 'takeaway': takeaway_orders, 'served': served_orders}
-    revenue_by_day = {}
-    for order in orders:
-        created_at = datetime.fromisoformat(order['createdAt'])
-        day = created_at.strftime('%a')
-        if day not in revenue_by_day:
-            revenue_by_day[day] = 0
-        revenue_by_day[day] += order['grandTotal']
-    revenue_by_day_list = [{'day': day, 'revenue': revenue} for day, revenue in revenue_by_day.items()]
-    chefs = await db.chefs.find({}, {'_id': 0}).to_list(1000)
-    chef_distribution = []
-    for chef in chefs:
-        chef_orders = len([o for o in orders if o.get('assignedChef') == chef['name']])
-        chef_distribution.append({'name': chef['name'], 'orders': chef_orders})
-    return Analytics(
-        totalChefs=total_chefs,
-        totalRevenue=total_revenue,
-        totalOrders=total_orders,
-        totalClients=total_clients,
-        ordersByType=orders_by_type,
-        revenueByDay=revenue_by_day_list,
-        chefOrderDistribution=chef_distribution
-    )
+async def get_analytics(start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to")):
+    start, end = parse_time_bound(start, "from"), parse_time_bound(end, "to")
+    chefs, total_clients = await asyncio.gather(store.chefs.all(), store.customers.count())
+    chef_names = [chef['name'] for chef in chefs]
+    if start or end:
+        totals = await analytics.read_range(store, chef_names, start, end)
+    else:
+        totals = await analytics.read(store, chef_names)
+    return Analytics(totalChefs=len(chefs), totalClients=total_clients, **totals)
 
 
 app.include_router(api_router)
 
 
+for name, help, callback in [
+    ("order_scheduler_pending", "Processing orders waiting for their deadline.", lambda: len(order_scheduler)),
+    ("order_stream_subscribers", "Open order event streams.", lambda: len(order_events)),
+    ("menu_cache_items", "Menu items in the catalog cache.", lambda: len(menu_catalog)),
+    ("customer_cache_entries", "Phone lookups in the customer cache.", lambda: len(customer_directory)),
+    ("table_index_free", "Free tables in the availability index.", lambda: len(table_availability)),
+    ("reservation_book_size", "Reservations held in memory.", lambda: len(reservation_book)),
+    ("kitchen_queue_orders", "Processing orders in the kitchen queue.", lambda: len(kitchen_queue)),
+    ("static_assets_loaded", "Frontend files held in memory.", lambda: len(static_assets)),
+]:
+    metrics_registry.register(Gauge(name, help, callback=callback))
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
+
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_store():
+    logger.info("Using %s storage", STORAGE_BACKEND)
+    await store.start()
+
+@app.on_event("startup")
+async def ensure_order_sequence():
+    await order_numbers.ensure_at_least(store, await store.orders.count())
+
+@app.on_event("startup")
+async def ensure_analytics():
+    await analytics.ensure(store)
+
+@app.on_event("startup")
+async def start_order_scheduler():
+    processing = await store.orders.processing()
+    order_scheduler.rebuild(processing)
+    kitchen_queue.rebuild(processing)
+    order_scheduler.start()
+    logger.info("Order scheduler started with %d processing orders", len(processing))
+
+@app.on_event("startup")
+async def load_static_assets():
+    if os.path.isdir(static_dir):
+        static_assets.load()
+        logger.info("Loaded %d static assets", len(static_assets))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    await order_scheduler.stop()
+    store.close()
+
 
+@app.api_route("/static/{asset_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_static(asset_path: str, request: Request):
+    asset = static_assets.get(f"/static/{asset_path}")
+    if not asset:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return static_assets.response(request, asset)
 
 @app.get("/{full_path:path}", include_in_schema=False)
-async def serve_spa(full_path: str):
-    index_path = os.path.join(static_dir, "index.html")
-    if os.path.exists(index_path):
-        return FileResponse(index_path, media_type="text/html")
+async def serve_spa(full_path: str, request: Request):
+    asset = static_assets.get(f"/{full_path}") or static_assets.get("/index.html")
+    if asset:
+        return static_assets.response(request, asset)
     return {"message": "API is running. Visit /docs for API docs."}
@@ -359,6 +359,21 @@ def test_orders_api():
                 else:
                     log_test_result('orders', 'Orders POST create', False, 
                                   f"HTTP {response.status_code}: {response.text}")
+
+                # Test batch creation: two valid orders and one with an unknown menu item
+                batch = [dict(order_data, customerPhone=generate_phone()) for _ in range(2)]
+                batch.append(dict(order_data, items=[dict(order_data['items'][0], menuItemId='menu_missing')]))
+                response = requests.post(f"{API_BASE}/orders/batch", json=batch, timeout=10)
+                if response.status_code == 200:
+                    results = response.json()
+                    if [r['ok'] for r in results] == [True, True, False] and results[2]['error']:
+                        log_test_result('orders', 'Orders POST batch', True)
+                    else:
+                        log_test_result('orders', 'Orders POST batch', False,
+                                      f"Unexpected per-item results: {results}")
+                else:
+                    log_test_result('orders', 'Orders POST batch', False,
+                                  f"HTTP {response.status_code}: {response.text}")
             else:
                 log_test_result('orders', 'Orders POST create', False, "No menu items available for order creation")
         
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Analytics benchmark: Python loops over every order vs a server-side $facet pipeline.
+
+Seeds a scratch database with synthetic orders and times both strategies at
+each size. Requires a running mongod:
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/analytics_benchmark.py 10000 100000 1000000
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+import analytics  # noqa: E402
+from repositories import open_store  # noqa: E402
+
+
+CHEFS = ["Harshavardhan", "Jalsa", "Anjan", "Madhu"]
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RUNS = 5
+
+
+async def seed(db, size, batch=10_000):
+    await db.orders.drop()
+    await db.orders.create_index('createdAt')
+    start = datetime.now(timezone.utc) - timedelta(days=90)
+    for offset in range(0, size, batch):
+        docs = []
+        for i in range(offset, min(offset + batch, size)):
+            total = random.randint(100, 2000)
+            docs.append({
+                'id': f"order_{i}",
+                'orderNumber': str(i + 108),
+                'customerName': "Bench",
+                'customerPhone': f"9{i:09d}",
+                'items': [{'menuItemId': 'menu_pizza_1', 'menuItemName': 'Marinara', 'quantity': 1, 'price': total}],
+                'type': random.choice(['dinein', 'takeaway']),
+                'status': random.choice(['processing', 'done', 'completed']),
+                'totalAmount': total,
+                'taxes': total * 0.05,
+                'deliveryCharge': 0,
+                'grandTotal': total * 1.05,
+                'processingTime': 600,
+                'remainingTime': 0,
+                'createdAt': (start + timedelta(seconds=i * 7776000 / size)).isoformat(),
+                'assignedChef': random.choice(CHEFS),
+            })
+        await db.orders.insert_many(docs, ordered=False)
+
+
+async def python_loops(store):
+    orders = await store.db.orders.find({}, {'_id': 0}).to_list(None)
+    total_revenue = sum(order['grandTotal'] for order in orders)
+    dinein = len([o for o in orders if o['type'] == 'dinein'])
+    takeaway = len([o for o in orders if o['type'] == 'takeaway'])
+    served = len([o for o in orders if o['status'] == 'done' or o['status'] == 'completed'])
+    revenue_by_day = {}
+    for order in orders:
+        day = datetime.fromisoformat(order['createdAt']).strftime('%a')
+        revenue_by_day[day] = revenue_by_day.get(day, 0) + order['grandTotal']
+    chefs = [{'name': name, 'orders': len([o for o in orders if o.get('assignedChef') == name])} for name in CHEFS]
+    return total_revenue, dinein, takeaway, served, revenue_by_day, chefs
+
+
+async def facet(store):
+    return await analytics.read_range(store, CHEFS)
+
+
+async def facet_last_week(store):
+    start = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    return await analytics.read_range(store, CHEFS, start=start)
+
+
+async def timed(fn, store):
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await fn(store)
+        samples.append(time.perf_counter() - started)
+    return min(samples), sum(samples) / len(samples)
+
+
+async def main(sizes):
+    uri = os.getenv("MONGO_URI") or os.getenv("MONGO_URL") or "mongodb://localhost:27017"
+    store = open_store('mongo', uri, os.getenv("BENCH_DB_NAME", "restaurant_bench"))
+    print(f"{'orders':>10} {'strategy':<16} {'best ms':>10} {'mean ms':>10}")
+    for size in sizes:
+        await seed(store.db, size)
+        for name, fn in [('python loops', python_loops), ('$facet', facet), ('$facet 7 days', facet_last_week)]:
+            best, mean = await timed(fn, store)
+            print(f"{size:>10} {name:<16} {best * 1000:>10.1f} {mean * 1000:>10.1f}")
+    await store.db.orders.drop()
+    store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES))
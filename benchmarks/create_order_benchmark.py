@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Checkout latency benchmark: the original sequential create_order vs the current one.
+
+Seeds a scratch database, then places the same orders through a copy of the
+original handler (eight sequential awaits) and through server.create_order,
+reporting p50/p99 latency at each concurrency level. Requires a running mongod:
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/create_order_benchmark.py --orders 2000 --concurrency 1 8 32
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "restaurant_bench")
+os.environ["STORAGE_BACKEND"] = "mongo"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import indexes  # noqa: E402
+import server  # noqa: E402
+
+
+MENU = [
+    {'id': f"menu_{i}", 'name': f"Item {i}", 'description': "", 'price': 100 + i, 'category': "Bench",
+     'stock': 100, 'averagePreparationTime': 5}
+    for i in range(50)
+]
+
+
+async def seed(db, tables):
+    for name in ('menu_items', 'tables', 'chefs', 'orders', 'customers', 'counters', 'analytics'):
+        await db[name].delete_many({})
+    await db.menu_items.insert_many([dict(m) for m in MENU])
+    await db.tables.insert_many([
+        {'id': f"table_{i}", 'number': i, 'chairCount': 4, 'name': f"Table {i}", 'status': 'available', 'customerId': None}
+        for i in range(1, tables + 1)
+    ])
+    await db.chefs.insert_many([{'id': f"chef_{i}", 'name': f"Chef {i}", 'currentOrders': 0} for i in range(4)])
+    await indexes.ensure_indexes(db)
+    server.menu_catalog.invalidate()
+
+
+def make_orders(count, tables):
+    orders = []
+    for i in range(count):
+        lines = random.sample(MENU, random.randint(1, 6))
+        dinein = i < tables
+        orders.append(server.OrderCreate(
+            tableNumber=i + 1 if dinein else None,
+            customerName=f"Customer {i}",
+            customerPhone=f"9{random.randint(0, 499):09d}",
+            items=[{'menuItemId': m['id'], 'menuItemName': m['name'], 'quantity': 1, 'price': m['price']} for m in lines],
+            type='dinein' if dinein else 'takeaway',
+        ))
+    return orders
+
+
+async def legacy_create_order(order):
+    db = server.store.db
+    if order.type == 'dinein' and order.tableNumber:
+        table = await db.tables.find_one({'number': order.tableNumber})
+        if not table:
+            raise RuntimeError("Table not found")
+        if table.get('status') == 'reserved':
+            raise RuntimeError("Table reserved!!!")
+    order_number = f"{await db.orders.count_documents({}) + 108}"
+    item_total = sum(item.price * item.quantity for item in order.items)
+    total_time = 0
+    for item in order.items:
+        menu_item = await db.menu_items.find_one({'id': item.menuItemId})
+        if menu_item:
+            total_time += menu_item['averagePreparationTime'] * item.quantity
+    chefs = sorted(await db.chefs.find({}).to_list(1000), key=lambda c: c['currentOrders'])
+    chef = random.choice([c for c in chefs if c['currentOrders'] == chefs[0]['currentOrders']])
+    await db.chefs.update_one({'id': chef['id']}, {'$inc': {'currentOrders': 1}})
+    if order.type == 'dinein' and order.tableNumber:
+        await db.tables.update_one({'number': order.tableNumber}, {'$set': {'status': 'reserved'}})
+    customer = await db.customers.find_one({'phone': order.customerPhone})
+    if customer:
+        await db.customers.update_one({'phone': order.customerPhone}, {'$inc': {'ordersCount': 1}})
+    else:
+        await db.customers.insert_one({'id': f"customer_{datetime.now().timestamp()}", 'name': order.customerName,
+                                       'phone': order.customerPhone, 'ordersCount': 1})
+    order_dict = order.model_dump()
+    order_dict.update({
+        'id': f"order_{datetime.now().timestamp()}", 'orderNumber': order_number, 'status': 'processing',
+        'totalAmount': item_total, 'taxes': item_total * 0.05, 'deliveryCharge': 0,
+        'grandTotal': item_total * 1.05, 'processingTime': total_time * 60, 'remainingTime': total_time * 60,
+        'createdAt': datetime.now(timezone.utc).isoformat(), 'assignedChef': chef['name'],
+    })
+    await db.orders.insert_one(order_dict)
+
+
+async def run(handler, orders, concurrency):
+    latencies = []
+    queue = list(orders)
+
+    async def worker():
+        while queue:
+            order = queue.pop()
+            started = time.perf_counter()
+            try:
+                await handler(order)
+            except Exception:
+                # customer-phone races in the legacy path are part of what is being measured
+                pass
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return sorted(latencies), time.perf_counter() - started
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+async def main(args):
+    await server.store.start()
+    print(f"{'path':<10} {'conc':>5} {'orders/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in args.concurrency:
+        for name, handler in [('before', legacy_create_order), ('after', server.create_order)]:
+            await seed(server.store.db, args.tables)
+            await server.order_numbers.ensure_at_least(server.store, 0)
+            latencies, elapsed = await run(handler, make_orders(args.orders, args.tables), concurrency)
+            print(f"{name:<10} {concurrency:>5} {len(latencies) / elapsed:>10.0f} "
+                  f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f}")
+    server.store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    asyncio.run(main(parser.parse_args()))
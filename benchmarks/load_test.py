@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Load test: replays a weighted mix of API calls against server.app in-process.
+
+Seeds a scratch database, runs the app's startup hooks and drives it through
+an httpx ASGI client, so no uvicorn or network hop is involved. Reports
+throughput, p50/p95/p99 latency and Mongo commands per request for each
+scenario. All sessions share one event loop, so a request's latency includes
+the time it waits behind the others. Against a running mongod:
+
+    MONGO_URI=mongodb://localhost:27017 python benchmarks/load_test.py --requests 5000 --concurrency 32
+
+Without one, --memory runs on the in-memory store (STORAGE_BACKEND=memory);
+latencies then measure the handlers rather than the database, and db ops
+counts the repository calls the Server-Timing header reports instead of Mongo
+commands.
+
+--save writes the results as a baseline; --compare reads one back and exits 1
+when any scenario's p95 or throughput is worse by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "restaurant_bench")
+os.environ["STORAGE_BACKEND"] = "memory" if "--memory" in sys.argv else "mongo"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+
+import server  # noqa: E402
+from repositories import MongoStore  # noqa: E402
+
+
+DEFAULT_MIX = "create=2,poll=10,menu=6,analytics=1"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "load_test.json"
+CATEGORIES = ["Pizza", "Burger", "Drink", "French fries", "Veggies"]
+MENU = [
+    {'id': f"menu_{i}", 'name': f"Item {i}", 'description': "", 'price': 100 + i,
+     'category': CATEGORIES[i % len(CATEGORIES)], 'stock': 100, 'averagePreparationTime': 3 + i % 12}
+    for i in range(60)
+]
+IGNORED_COMMANDS = {'hello', 'ismaster', 'isMaster', 'endSessions', 'ping'}
+ROUND_TRIPS = re.compile(r'desc="(\d+) round trips"')
+
+scenario = contextvars.ContextVar('scenario', default=None)
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts Mongo commands per scenario.
+
+    Motor runs pymongo in executor threads with the caller's context copied,
+    so ``scenario`` still names the request that issued the command; commands
+    from the order scheduler and other background tasks are not counted.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        name = scenario.get()
+        if name and event.command_name not in IGNORED_COMMANDS:
+            with self._lock:
+                self.counts[name] = self.counts.get(name, 0) + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class RoundTripCounter:
+    """Counts round trips per scenario from the ``Server-Timing`` header.
+
+    budget.RoundTripBudget reports each request's ``Usage`` there, which on
+    the in-memory store counts repository calls; an httpx response hook
+    reads it in the worker's context, where ``scenario`` is set.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    async def observe(self, response):
+        name = scenario.get()
+        match = ROUND_TRIPS.search(response.headers.get('server-timing', ''))
+        if name and match:
+            self.counts[name] = self.counts.get(name, 0) + int(match.group(1))
+
+
+def connect(memory):
+    if memory:
+        return RoundTripCounter()
+    counter = CommandCounter()
+    server.store.close()
+    server.store = MongoStore(os.environ["MONGO_URI"], os.environ["DB_NAME"], event_listeners=[counter])
+    return counter
+
+
+async def seed(store, tables, history):
+    if isinstance(store, MongoStore):
+        for name in ('menu_items', 'tables', 'chefs', 'orders', 'customers', 'counters', 'analytics', 'reservations'):
+            await store.db[name].delete_many({})
+    for item in MENU:
+        await store.menu.insert(item)
+    for i in range(1, tables + 1):
+        await store.tables.insert({'id': f"table_{i}", 'number': i, 'chairCount': random.choice([2, 4, 6, 8]),
+                                   'name': f"Table {i}", 'status': 'available', 'customerId': None})
+    for i, name in enumerate(["Harshavardhan", "Jalsa", "Anjan", "Madhu"]):
+        await store.chefs.insert({'id': f"chef_{i}", 'name': name, 'currentOrders': 0})
+    for handler in server.app.router.on_startup:
+        await handler()
+    server.menu_catalog.invalidate()
+    server.table_availability.invalidate()
+    for offset in range(0, history, server.MAX_ORDER_BATCH):
+        count = min(server.MAX_ORDER_BATCH, history - offset)
+        await server.create_orders_batch([order_payload(offset + i, dinein=False) for i in range(count)])
+
+
+def order_payload(i, dinein, table_number=None):
+    lines = random.sample(MENU, random.randint(1, 5))
+    return server.OrderCreate(
+        tableNumber=table_number if dinein else None,
+        customerName=f"Customer {i}",
+        customerPhone=f"9{random.randint(0, 4999):09d}",
+        items=[{'menuItemId': m['id'], 'menuItemName': m['name'], 'quantity': random.randint(1, 3), 'price': m['price']}
+               for m in lines],
+        type='dinein' if dinein else 'takeaway',
+    )
+
+
+class Session:
+    """One simulated client: a POS terminal, kitchen screen or customer phone."""
+
+    def __init__(self, http, tables):
+        self.http = http
+        self.tables = tables
+        self.cursor = None
+        self.menu_etag = None
+        self.placed = 0
+
+    async def create(self):
+        self.placed += 1
+        dinein = random.random() < 0.4
+        payload = order_payload(self.placed, dinein, random.randint(1, self.tables)).model_dump()
+        response = await self.http.post("/api/orders", json=payload)
+        # a dine-in order on a table that is already taken is a normal 400
+        return response.status_code in (200, 400)
+
+    async def poll(self):
+        params = {'since': self.cursor} if self.cursor else {'limit': 100}
+        response = await self.http.get("/api/orders", params=params)
+        if response.status_code != 200:
+            return False
+        # A full listing carries its cursor in a header; a since= delta carries the next one in its body.
+        self.cursor = response.json()['cursor'] if self.cursor else response.headers['X-Orders-Cursor']
+        return True
+
+    async def menu(self):
+        headers = {'If-None-Match': self.menu_etag} if self.menu_etag else {}
+        params = {'category': random.choice(CATEGORIES)} if random.random() < 0.5 else {}
+        response = await self.http.get("/api/menu", params=params, headers=headers)
+        self.menu_etag = response.headers.get('ETag', self.menu_etag)
+        return response.status_code in (200, 304)
+
+    async def analytics(self):
+        response = await self.http.get("/api/analytics")
+        return response.status_code == 200
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ('create', 'poll', 'menu', 'analytics'):
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))] if samples else 0.0
+
+
+async def run(http, mix, total, concurrency, tables, counter):
+    names, weights = list(mix), list(mix.values())
+    plan = random.choices(names, weights, k=total)
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    async def worker():
+        session = Session(http, tables)
+        while plan:
+            name = plan.pop()
+            token = scenario.set(name)
+            started = time.perf_counter()
+            ok = await getattr(session, name)()
+            latencies[name].append(time.perf_counter() - started)
+            scenario.reset(token)
+            errors[name] += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    results = {}
+    for name in names:
+        samples = sorted(latencies[name])
+        results[name] = {
+            'requests': len(samples),
+            'errors': errors[name],
+            'rps': len(samples) / elapsed,
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'db_ops': counter.counts.get(name, 0) / len(samples) if counter and samples else None,
+        }
+    return results
+
+
+def report(results):
+    print(f"{'scenario':<10} {'reqs':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'db ops':>7}")
+    for name, r in results.items():
+        db_ops = f"{r['db_ops']:.1f}" if r['db_ops'] is not None else "-"
+        print(f"{name:<10} {r['requests']:>6} {r['errors']:>6} {r['rps']:>8.0f} {r['p50_ms']:>8.2f} "
+              f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {db_ops:>7}")
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            found.append(f"{name}: p95 {base['p95_ms']:.2f} ms -> {r['p95_ms']:.2f} ms")
+        if r['rps'] < base['rps'] * (1 - tolerance):
+            found.append(f"{name}: throughput {base['rps']:.0f} -> {r['rps']:.0f} req/s")
+        if r['db_ops'] is not None and base.get('db_ops') is not None and r['db_ops'] > base['db_ops'] + 0.5:
+            found.append(f"{name}: db ops/request {base['db_ops']:.1f} -> {r['db_ops']:.1f}")
+    return found
+
+
+async def main(args):
+    counter = connect(args.memory)
+    await seed(server.store, args.tables, args.history)
+    hooks = {'response': [counter.observe]} if args.memory else {}
+    async with AsyncClient(transport=ASGITransport(app=server.app), base_url="http://bench", event_hooks=hooks) as http:
+        if args.warmup:
+            await run(http, args.mix, args.warmup, args.concurrency, args.tables, None)
+        if counter:
+            counter.counts.clear()
+        results = await run(http, args.mix, args.requests, args.concurrency, args.tables, counter)
+    for handler in server.app.router.on_shutdown:
+        await handler()
+    report(results)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline saved to {args.save}")
+    if args.compare:
+        found = regressions(results, json.loads(args.compare.read_text()), args.tolerance)
+        for line in found:
+            print(f"❌ {line}")
+        if found:
+            sys.exit(1)
+        print(f"✅ Within {args.tolerance:.0%} of {args.compare}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--history", type=int, default=2000, help="orders placed before the run starts")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--memory", action="store_true", help="use the in-memory store instead of MONGO_URI")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", type=Path, nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    asyncio.run(main(args))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: response_model validation + stdlib json vs the FAST_RESPONSES path.
+
+Builds synthetic /api/orders and /api/menu payloads and times what FastAPI
+does with a handler's return value in each mode: validating it against the
+response model and encoding it with JSONResponse, or projecting the stored
+documents with responses.Shape and encoding them with FastJSONResponse
+(orjson when installed). No database or server is involved:
+
+    python benchmarks/serialization_benchmark.py 1000 5000 10000
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+import responses  # noqa: E402
+from server import MenuItem, Order  # noqa: E402
+
+
+CATEGORIES = ["Pizza", "Burger", "Drink", "French fries", "Veggies"]
+DEFAULT_SIZES = [1_000, 5_000, 10_000]
+RUNS = 5
+
+
+def orders(size):
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    docs = []
+    for i in range(size):
+        items = [
+            {'menuItemId': f"menu_{j}", 'menuItemName': f"Item {j}", 'quantity': random.randint(1, 3),
+             'price': float(100 + j), 'cookingInstructions': None}
+            for j in random.sample(range(60), random.randint(1, 5))
+        ]
+        total = sum(item['price'] * item['quantity'] for item in items)
+        created_at = (start + timedelta(seconds=i)).isoformat()
+        docs.append({
+            'id': f"order_{i}", 'orderNumber': str(i + 108), 'tableNumber': None,
+            'customerName': f"Customer {i}", 'customerPhone': f"9{i:09d}", 'customerAddress': None,
+            'items': items, 'type': 'takeaway', 'status': random.choice(['processing', 'done']),
+            'totalAmount': total, 'taxes': total * 0.05, 'deliveryCharge': 50.0, 'grandTotal': total * 1.05 + 50,
+            'processingTime': 600, 'remainingTime': 0, 'createdAt': created_at, 'updatedAt': created_at,
+            'assignedChef': "Anjan", 'cookingInstructions': None,
+        })
+    return docs
+
+
+def menu(size):
+    return [
+        {'id': f"menu_{i}", 'name': f"Item {i}", 'description': "Freshly made", 'price': float(100 + i % 400),
+         'category': CATEGORIES[i % len(CATEGORIES)], 'stock': 100, 'averagePreparationTime': 3 + i % 12,
+         'imageUrl': None}
+        for i in range(size)
+    ]
+
+
+def validated(model):
+    field = create_response_field(name=f"Response_{model.__name__}", type_=List[model])
+
+    async def encode(docs):
+        content = await serialize_response(field=field, response_content=docs)
+        return JSONResponse(content).body
+    return encode
+
+
+def fast(model):
+    shape = responses.Shape(model)
+
+    async def encode(docs):
+        return responses.FastJSONResponse(shape.all(docs)).body
+    return encode
+
+
+async def timed(fn, docs):
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await fn(docs)
+        samples.append(time.perf_counter() - started)
+    return min(samples), sum(samples) / len(samples)
+
+
+async def main(sizes):
+    encoder = "orjson" if responses.orjson is not None else "stdlib json"
+    print(f"FAST_RESPONSES encoder: {encoder}")
+    print(f"{'payload':<8} {'rows':>8} {'strategy':<16} {'best ms':>10} {'mean ms':>10} {'speedup':>8}")
+    for name, model, build in [('orders', Order, orders), ('menu', MenuItem, menu)]:
+        for size in sizes:
+            docs = build(size)
+            baseline = None
+            for strategy, fn in [('response_model', validated(model)), ('fast', fast(model))]:
+                best, mean = await timed(fn, docs)
+                baseline = baseline or best
+                print(f"{name:<8} {size:>8} {strategy:<16} {best * 1000:>10.1f} {mean * 1000:>10.1f} "
+                      f"{baseline / best:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES))
@@ -13,5 +13,15 @@ echo " Copying React build into backend/static..."
 rm -rf ../backend/static/*
 cp -r build/* ../backend/static/
 
+echo " Precompressing static assets..."
+find ../backend/static -type f \( -name '*.html' -o -name '*.js' -o -name '*.css' -o -name '*.json' -o -name '*.svg' -o -name '*.map' -o -name '*.txt' \) -size +1k \
+    -exec gzip -9 -k -f -n {} \;
+if command -v brotli >/dev/null 2>&1; then
+    find ../backend/static -type f \( -name '*.html' -o -name '*.js' -o -name '*.css' -o -name '*.json' -o -name '*.svg' -o -name '*.map' -o -name '*.txt' \) -size +1k \
+        -exec brotli -q 11 -k -f {} \;
+else
+    echo " brotli not found, serving gzip only"
+fi
+
 echo " Build completed successfully!"
 
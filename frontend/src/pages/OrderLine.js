@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { UtensilsCrossed, Clock, Check } from 'lucide-react';
 import Sidebar from '@/components/Sidebar';
@@ -7,19 +7,53 @@ import Sidebar from '@/components/Sidebar';
 const RAW_BACKEND = process.env.REACT_APP_BACKEND_URL || '';
 const BACKEND_URL = RAW_BACKEND.replace(/\/+$/, ''); 
 const API = BACKEND_URL ? `${BACKEND_URL}/api` : '/api';
+const QUEUE_REFRESH_DELAY = 1000;
 
 console.log('OrderLine using API base ->', API);
 
 const OrderLine = () => {
   const [orders, setOrders] = useState([]);
+  const [queuePosition, setQueuePosition] = useState({});
   const [filter, setFilter] = useState('all');
+  const [now, setNow] = useState(Date.now());
+  const queueRefresh = useRef(null);
 
   useEffect(() => {
     fetchOrders();
-    const interval = setInterval(fetchOrders, 5000); 
-    return () => clearInterval(interval);
+    fetchKitchenQueue();
+    const source = new EventSource(`${API}/orders/stream`);
+    source.addEventListener('created', (event) => {
+      const order = JSON.parse(event.data);
+      if (filter === 'all' || order.status === filter) {
+        setOrders((prev) => [order, ...prev.filter((o) => o.id !== order.id)]);
+      }
+      refreshKitchenQueue();
+    });
+    source.addEventListener('status', (event) => {
+      const change = JSON.parse(event.data);
+      if (filter === 'all') {
+        setOrders((prev) => prev.map((o) => (o.id === change.id ? { ...o, ...change } : o)));
+      } else {
+        fetchOrders();
+      }
+      refreshKitchenQueue();
+    });
+    source.addEventListener('reset', () => {
+      fetchOrders();
+      refreshKitchenQueue();
+    });
+    return () => {
+      source.close();
+      clearTimeout(queueRefresh.current);
+      queueRefresh.current = null;
+    };
   }, [filter]);
 
+  useEffect(() => {
+    const ticker = setInterval(() => setNow(Date.now()), 30000);
+    return () => clearInterval(ticker);
+  }, []);
+
   const fetchOrders = async () => {
     try {
       const url = filter === 'all' ? `${API}/orders` : `${API}/orders?status=${filter}`;
@@ -30,6 +64,30 @@ const OrderLine = () => {
     }
   };
 
+  const fetchKitchenQueue = async () => {
+    try {
+      const response = await axios.get(`${API}/kitchen/queue`);
+      const positions = {};
+      response.data.chefs.forEach((chef) => {
+        chef.orders.forEach((order) => {
+          positions[order.id] = order.position;
+        });
+      });
+      setQueuePosition(positions);
+    } catch (error) {
+      console.error('Error fetching kitchen queue:', error);
+    }
+  };
+
+  // A batch of orders arrives as one event per order; refetch the queue once for all of them.
+  const refreshKitchenQueue = () => {
+    if (queueRefresh.current) return;
+    queueRefresh.current = setTimeout(() => {
+      queueRefresh.current = null;
+      fetchKitchenQueue();
+    }, QUEUE_REFRESH_DELAY);
+  };
+
   const updateOrderStatus = async (orderId, newStatus) => {
     try {
       await axios.put(`${API}/orders/${orderId}/status?status=${newStatus}`);
@@ -39,6 +97,12 @@ const OrderLine = () => {
     }
   };
 
+  // Orders are marked done at createdAt + processingTime; the kitchen queue only says what is cooked first.
+  const remainingSeconds = (order) => {
+    const elapsed = Math.floor((now - new Date(order.createdAt).getTime()) / 1000);
+    return Math.max(0, order.processingTime - elapsed);
+  };
+
   const formatTime = (seconds) => {
     const mins = Math.floor(seconds / 60);
     return `${mins} Min`;
@@ -57,7 +121,12 @@ const OrderLine = () => {
 
   const getStatusBadge = (order) => {
     if (order.status === 'processing') {
-      return <span className="text-xs bg-orange-400 text-white px-2 py-1 rounded">Ongoing {formatTime(order.remainingTime || 240)}</span>;
+      const position = queuePosition[order.id];
+      return (
+        <span className="text-xs bg-orange-400 text-white px-2 py-1 rounded">
+          Ongoing {formatTime(remainingSeconds(order))}{position > 0 ? ` · #${position + 1} in queue` : ''}
+        </span>
+      );
     } else if (order.status === 'done' && order.type === 'dinein') {
       return <span className="text-xs bg-green-600 text-white px-2 py-1 rounded">Done Served</span>;
     } else if (order.status === 'done' && order.type === 'takeaway') {
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Index verification for Restaurant Management System
+Ensures the declared indexes and fails if a hot query falls back to COLLSCAN
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+BACKEND_DIR = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+load_dotenv(BACKEND_DIR / '.env')
+
+import indexes  # noqa: E402
+
+
+async def check_hot_queries_use_indexes():
+    client = AsyncIOMotorClient(os.getenv('MONGO_URI') or os.getenv('MONGO_URL'))
+    db = client.get_database(os.getenv('DB_NAME', 'restaurant'))
+    try:
+        failed = await indexes.ensure_indexes(db)
+        for collection, name in failed:
+            print(f"❌ Could not create index {collection}.{name}")
+
+        report = await indexes.index_report(db)
+        for collection, name in report['missing']:
+            print(f"❌ Missing index {collection}.{name}")
+        for collection, name in report['undeclared']:
+            print(f"⚠️  Undeclared index {collection}.{name}")
+
+        offenders = await indexes.collection_scans(db)
+        for name, stages in offenders:
+            print(f"❌ {name} falls back to COLLSCAN: {' <- '.join(s for s in stages if s)}")
+        if not offenders:
+            print(f"✅ All {len(indexes.HOT_QUERIES)} hot queries use an index")
+
+        return not failed and not report['missing'] and not offenders
+    finally:
+        client.close()
+
+
+def test_hot_queries_use_indexes():
+    """Every query in indexes.HOT_QUERIES must be answered from an index"""
+    assert asyncio.run(check_hot_queries_use_indexes())
+
+
+if __name__ == "__main__":
+    success = asyncio.run(check_hot_queries_use_indexes())
+
+    if success:
+        print("\n🎉 Index verification PASSED!")
+    else:
+        print("\n❌ Index verification FAILED!")
+        sys.exit(1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Kitchen queue ETA check for Restaurant Management System
+Drives KitchenQueue directly and fails if a chef's orders are not estimated
+in cooking order, if removing the order on the stove does not move the next
+one up, or if deleting a table leaves stale table numbers in the queue
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from kitchen import KitchenQueue, timestamp  # noqa: E402
+
+OPENING = datetime(2031, 3, 14, 18, 0, tzinfo=timezone.utc)
+
+
+def order(order_id, minute, processing_time, chef='chef_1', table_number=None):
+    return {
+        'id': order_id,
+        'orderNumber': order_id.upper(),
+        'type': 'dinein' if table_number else 'takeaway',
+        'tableNumber': table_number,
+        'assignedChef': chef,
+        'createdAt': (OPENING + timedelta(minutes=minute)).isoformat(),
+        'processingTime': processing_time,
+    }
+
+
+def rows(queue, chef='chef_1'):
+    return next(c['orders'] for c in queue.view()['chefs'] if c['chef'] == chef)
+
+
+def seconds(row, field):
+    return timestamp(row[field]) - OPENING.timestamp()
+
+
+def check(success, ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return success and ok
+
+
+def check_kitchen_queue():
+    success = True
+    queue = KitchenQueue()
+    # Placed out of order: b is older than c, and a is already on the stove
+    queue.rebuild([order('a', 0, 600), order('c', 2, 300), order('b', 1, 120)])
+
+    listed = rows(queue)
+    success = check(success, [r['id'] for r in listed] == ['a', 'b', 'c'], "A chef's orders are listed oldest first")
+    success = check(success, [seconds(r, 'readyAt') for r in listed] == [600, 720, 1020],
+                    "Each order is ready after the ones ahead of it")
+
+    queue.add(order('old', -1, 60))
+    success = check(success, rows(queue)[0]['id'] == 'a',
+                    "An older order queues behind the one already on the stove")
+    queue.remove('old')
+
+    version = queue.version
+    queue.remove('a', now=OPENING.timestamp() + 300)
+    listed = rows(queue)
+    success = check(success, queue.version > version, "Removing an order changes the queue version")
+    success = check(success, [r['id'] for r in listed] == ['b', 'c'] and listed[0]['position'] == 0,
+                    "The next order moves to the head when the head is removed")
+    success = check(success, [seconds(r, 'readyAt') for r in listed] == [420, 720],
+                    "The new head starts when the old one was taken off the stove")
+
+    queue.add(order('u1', 0, 600, chef=None))
+    queue.add(order('u2', 1, 60, chef=None))
+    unassigned = {r['id']: seconds(r, 'readyAt') for r in rows(queue, chef=None)}
+    success = check(success, unassigned == {'u1': 600, 'u2': 120},
+                    "Unassigned orders are each estimated from their own createdAt")
+
+    queue.add(order('t2', 3, 60, table_number=2))
+    queue.add(order('t5', 4, 60, chef='chef_2', table_number=5))
+    queue.close_table_gap(3)
+    tables = {r['id']: r['tableNumber'] for c in queue.view()['chefs'] for r in c['orders'] if r['tableNumber']}
+    success = check(success, tables == {'t2': 2, 't5': 4},
+                    "Deleting a table shifts only the table numbers after it")
+    return success
+
+
+def test_kitchen_queue():
+    """Kitchen ETAs follow cooking order, the head hands over on removal, and table numbers follow a delete"""
+    assert check_kitchen_queue()
+
+
+if __name__ == "__main__":
+    success = check_kitchen_queue()
+
+    if success:
+        print("\n🎉 Kitchen queue check PASSED!")
+    else:
+        print("\n❌ Kitchen queue check FAILED!")
+        sys.exit(1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Delta-sync check for Restaurant Management System
+Drives GET /api/orders?since= in-process on the in-memory store and fails if
+a burst of more than ORDER_CHANGES_LIMIT changes is not delivered in full
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Same settings as roundtrip_test.py, which may share this server module under pytest
+os.environ['STORAGE_BACKEND'] = 'memory'
+os.environ['DB_BUDGET_MODE'] = 'fail'
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import server  # noqa: E402
+
+BATCHES = 3
+MAX_POLLS = 10
+
+
+def order(i):
+    return {
+        'customerName': f"Burst {i}",
+        'customerPhone': f"91234{i:05d}",
+        'items': [{'menuItemId': 'menu_oc', 'menuItemName': "Fries", 'quantity': 1, 'price': 90}],
+        'type': 'takeaway',
+    }
+
+
+async def check_order_changes_page_through_a_burst():
+    for handler in server.app.router.on_startup:
+        await handler()
+    await server.store.menu.insert({'id': 'menu_oc', 'name': "Fries", 'description': "", 'price': 90,
+                                    'category': "French fries", 'stock': 50, 'averagePreparationTime': 5})
+    since = datetime.now(timezone.utc).isoformat()
+    created, seen, updated = set(), set(), []
+    polls = 0
+    try:
+        async with AsyncClient(transport=ASGITransport(app=server.app), base_url='http://test') as http:
+            for batch in range(BATCHES):
+                response = await http.post('/api/orders/batch', json=[
+                    order(batch * server.MAX_ORDER_BATCH + i) for i in range(server.MAX_ORDER_BATCH)
+                ])
+                created.update(r['order']['id'] for r in response.json() if r['ok'])
+                updated += [r['order']['updatedAt'] for r in response.json() if r['ok']]
+
+            cursor = since
+            while polls < MAX_POLLS:
+                response = await http.get('/api/orders', params={'since': cursor})
+                polls += 1
+                if response.status_code != 200:
+                    print(f"❌ Poll {polls} returned {response.status_code}: {response.text}")
+                    return False
+                changes = response.json()
+                seen.update(o['id'] for o in changes['orders'])
+                if len(changes['orders']) < server.ORDER_CHANGES_LIMIT:
+                    break
+                cursor = changes['cursor']
+    finally:
+        for handler in server.app.router.on_shutdown:
+            await handler()
+
+    success = True
+    burst = datetime.fromisoformat(max(updated)) - datetime.fromisoformat(min(updated))
+    if burst >= server.ORDER_CHANGES_OVERLAP:
+        print(f"⚠️  Burst took {burst.total_seconds():.1f}s, longer than the overlap window")
+    if len(created) <= server.ORDER_CHANGES_LIMIT:
+        print(f"❌ Only {len(created)} orders created, need more than {server.ORDER_CHANGES_LIMIT}")
+        success = False
+    missing = created - seen
+    if missing:
+        print(f"❌ {len(missing)} of {len(created)} changed orders never delivered after {polls} polls")
+        success = False
+    else:
+        print(f"✅ All {len(created)} changed orders delivered in {polls} polls")
+    return success
+
+
+def test_order_changes_page_through_a_burst():
+    """A burst larger than one page of changes is delivered in full, one page per poll"""
+    assert asyncio.run(check_order_changes_page_through_a_burst())
+
+
+if __name__ == "__main__":
+    success = asyncio.run(check_order_changes_page_through_a_burst())
+
+    if success:
+        print("\n🎉 Delta-sync check PASSED!")
+    else:
+        print("\n❌ Delta-sync check FAILED!")
+        sys.exit(1)
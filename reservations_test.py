@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Reservation conflict check for Restaurant Management System
+Drives /api/reservations and /api/tables/free in-process on the in-memory
+store and fails if overlapping bookings, cancellations, party sizes or past
+windows are handled wrongly
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Same settings as roundtrip_test.py, which may share this server module under pytest
+os.environ['STORAGE_BACKEND'] = 'memory'
+os.environ['DB_BUDGET_MODE'] = 'fail'
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import server  # noqa: E402
+
+EVENING = '2031-03-14T19:00:00+00:00'
+LATE = '2031-03-14T21:00:00+00:00'
+CLOSING = '2031-03-14T23:00:00+00:00'
+OVERLAP = '2031-03-14T20:59:00+00:00'
+
+
+def booking(table_id, start, end, party=2):
+    return {'tableId': table_id, 'start': start, 'end': end, 'partySize': party,
+            'customerName': "Booking", 'customerPhone': "9876501234"}
+
+
+def check(success, ok, message):
+    print(f"{'✅' if ok else '❌'} {message}")
+    return success and ok
+
+
+async def check_reservation_conflicts():
+    for handler in server.app.router.on_startup:
+        await handler()
+    success = True
+    tables = []
+    try:
+        async with AsyncClient(transport=ASGITransport(app=server.app), base_url='http://test') as http:
+            small = (await http.post('/api/tables', json={'chairCount': 2, 'name': "Window"})).json()
+            large = (await http.post('/api/tables', json={'chairCount': 6, 'name': "Booth"})).json()
+            tables = [small, large]
+
+            first = await http.post('/api/reservations', json=booking(small['id'], EVENING, LATE))
+            success = check(success, first.status_code == 200, f"First booking accepted ({first.status_code})")
+            second = await http.post('/api/reservations', json=booking(small['id'], LATE, CLOSING))
+            success = check(success, second.status_code == 200,
+                            f"Back-to-back booking accepted ({second.status_code})")
+            clash = await http.post('/api/reservations', json=booking(small['id'], OVERLAP, CLOSING))
+            success = check(success, clash.status_code == 409,
+                            f"Booking overlapping by one minute rejected ({clash.status_code})")
+
+            await http.delete(f"/api/reservations/{second.json()['id']}")
+            freed = await http.post('/api/reservations', json=booking(small['id'], LATE, CLOSING))
+            success = check(success, freed.status_code == 200,
+                            f"Cancelled booking frees its slot ({freed.status_code})")
+
+            window = {'start': EVENING, 'end': LATE}
+            free = await http.get('/api/tables/free', params={**window, 'party': 4})
+            free_ids = [t['id'] for t in free.json()]
+            success = check(success, large['id'] in free_ids and small['id'] not in free_ids,
+                            "/tables/free only offers tables that seat the party")
+
+            negative = await http.post('/api/reservations', json=booking(large['id'], EVENING, LATE, party=-3))
+            success = check(success, negative.status_code == 422,
+                            f"Negative party size rejected ({negative.status_code})")
+
+            now = datetime.now(timezone.utc)
+            past = booking(large['id'], (now - timedelta(days=2, hours=2)).isoformat(),
+                           (now - timedelta(days=2)).isoformat())
+            ended = await http.post('/api/reservations', json=past)
+            success = check(success, ended.status_code == 400,
+                            f"Booking for a window that has ended rejected ({ended.status_code})")
+
+            await server.store.reservations.insert({**past, 'id': 'reservation_past', 'createdAt': past['start']})
+            params = {'from': (now - timedelta(days=3)).isoformat(), 'to': (now - timedelta(days=1)).isoformat()}
+            history = await http.get('/api/reservations', params=params)
+            success = check(success, [r['id'] for r in history.json()] == ['reservation_past'],
+                            "Windows older than the in-memory horizon are answered from the store")
+    finally:
+        for table in tables:
+            await server.store.reservations.delete_for_table(table['id'])
+            await server.store.tables.delete_unreserved(table['id'])
+            server.reservation_book.remove_table(table['id'])
+        server.table_availability.invalidate()
+        for handler in server.app.router.on_shutdown:
+            await handler()
+    return success
+
+
+def test_reservation_conflicts():
+    """Back-to-back bookings fit, overlaps are refused and cancelling frees the slot"""
+    assert asyncio.run(check_reservation_conflicts())
+
+
+if __name__ == "__main__":
+    success = asyncio.run(check_reservation_conflicts())
+
+    if success:
+        print("\n🎉 Reservation check PASSED!")
+    else:
+        print("\n❌ Reservation check FAILED!")
+        sys.exit(1)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Database round-trip budget check for Restaurant Management System
+Drives the API in-process on the in-memory store with DB_BUDGET_MODE=fail
+and fails if a route makes more round trips than it is allowed
+"""
+
+import asyncio
+import os
+import re
+import sys
+from pathlib import Path
+
+os.environ['STORAGE_BACKEND'] = 'memory'
+os.environ['DB_BUDGET_MODE'] = 'fail'
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+import server  # noqa: E402
+
+# Most round trips each call may make. Raise a number only when the extra
+# query is intended; a loop over the database belongs in a batch query.
+ROUTE_BUDGETS = [
+    ('POST', '/api/menu', 1),
+    ('GET', '/api/menu', 1),
+    ('GET', '/api/menu/categories/list', 0),
+    ('POST', '/api/tables', 2),
+    ('GET', '/api/tables', 1),
+    ('GET', '/api/tables/available', 1),
+    ('POST', '/api/chefs', 1),
+    ('GET', '/api/chefs', 1),
+    ('POST', '/api/orders', 5),
+    ('POST', '/api/orders/batch', 8),
+    ('GET', '/api/orders', 1),
+    ('GET', '/api/orders?since', 1),
+    ('PUT', '/api/orders/{order_id}/status', 3),
+    ('GET', '/api/orders/{order_id}', 1),
+    ('GET', '/api/kitchen/queue', 0),
+    ('POST', '/api/reservations', 4),
+    ('GET', '/api/reservations', 0),
+    ('GET', '/api/reservations?from=past', 1),
+    ('GET', '/api/tables/free', 1),
+    ('GET', '/api/customers', 1),
+    ('GET', '/api/customers/{phone}', 1),
+    ('GET', '/api/analytics', 3),
+    ('DELETE', '/api/tables/{table_id}', 4),
+]
+
+
+def round_trips(response):
+    match = re.search(r'desc="(\d+) round trips"', response.headers.get('server-timing', ''))
+    return int(match.group(1)) if match else None
+
+
+def order(i, table_number=None):
+    return {
+        'tableNumber': table_number,
+        'customerName': f"Customer {i}",
+        'customerPhone': f"98765{i:05d}",
+        'items': [{'menuItemId': 'menu_rt', 'menuItemName': "Margherita", 'quantity': 2, 'price': 250}],
+        'type': 'dinein' if table_number else 'takeaway',
+    }
+
+
+async def check_round_trip_budgets():
+    for handler in server.app.router.on_startup:
+        await handler()
+    await server.store.menu.insert({'id': 'menu_rt', 'name': "Margherita", 'description': "", 'price': 250,
+                                    'category': "Pizza", 'stock': 50, 'averagePreparationTime': 10})
+    transport = ASGITransport(app=server.app)
+    results = {}
+    try:
+        async with AsyncClient(transport=transport, base_url='http://test') as http:
+            async def call(key, method, url, **kwargs):
+                response = await http.request(method, url, **kwargs)
+                results[key] = (response.status_code, round_trips(response), response.text)
+                return response
+
+            await call(('POST', '/api/menu'), 'POST', '/api/menu', json={
+                'name': "Fries", 'description': "", 'price': 90, 'category': "French fries",
+                'stock': 50, 'averagePreparationTime': 5
+            })
+            await call(('GET', '/api/menu'), 'GET', '/api/menu')
+            await call(('GET', '/api/menu/categories/list'), 'GET', '/api/menu/categories/list')
+            for chairs in (2, 4, 6):
+                table = await call(('POST', '/api/tables'), 'POST', '/api/tables', json={'chairCount': chairs})
+            await call(('GET', '/api/tables'), 'GET', '/api/tables')
+            await call(('GET', '/api/tables/available'), 'GET', '/api/tables/available', params={'party': 3})
+            for name in ("Anjan", "Madhu"):
+                await call(('POST', '/api/chefs'), 'POST', '/api/chefs', json={'name': name})
+            await call(('GET', '/api/chefs'), 'GET', '/api/chefs')
+
+            created = await call(('POST', '/api/orders'), 'POST', '/api/orders', json=order(1, table_number=1))
+            await call(('POST', '/api/orders'), 'POST', '/api/orders', json=order(2))
+            await call(('POST', '/api/orders/batch'), 'POST', '/api/orders/batch',
+                       json=[order(i) for i in range(3, 23)] + [order(23, table_number=2)])
+            listing = await call(('GET', '/api/orders'), 'GET', '/api/orders', params={'limit': 5})
+            await call(('GET', '/api/orders?since'), 'GET', '/api/orders',
+                       params={'since': listing.headers.get('x-orders-cursor', '')})
+            order_id = created.json()['id']
+            await call(('PUT', '/api/orders/{order_id}/status'), 'PUT', f'/api/orders/{order_id}/status',
+                       params={'status': 'done'})
+            await call(('GET', '/api/orders/{order_id}'), 'GET', f'/api/orders/{order_id}')
+            await call(('GET', '/api/kitchen/queue'), 'GET', '/api/kitchen/queue')
+
+            window = {'start': '2030-01-01T18:00:00+00:00', 'end': '2030-01-01T20:00:00+00:00'}
+            await call(('POST', '/api/reservations'), 'POST', '/api/reservations',
+                       json={'tableId': table.json()['id'], 'partySize': 4, 'customerName': "Jalsa",
+                             'customerPhone': "9876543210", **window})
+            await call(('GET', '/api/reservations'), 'GET', '/api/reservations', params={'from': window['start']})
+            await call(('GET', '/api/reservations?from=past'), 'GET', '/api/reservations')
+            await call(('GET', '/api/tables/free'), 'GET', '/api/tables/free', params=window)
+            await call(('GET', '/api/customers'), 'GET', '/api/customers')
+            await call(('GET', '/api/customers/{phone}'), 'GET', '/api/customers/9876500001')
+            await call(('GET', '/api/analytics'), 'GET', '/api/analytics')
+            await call(('DELETE', '/api/tables/{table_id}'), 'DELETE', f"/api/tables/{table.json()['id']}")
+    finally:
+        for handler in server.app.router.on_shutdown:
+            await handler()
+
+    success = True
+    for method, route, budget in ROUTE_BUDGETS:
+        status, trips, body = results.get((method, route), (None, None, ''))
+        if status is None:
+            print(f"❌ {method} {route}: not exercised")
+            success = False
+        elif status >= 500:
+            print(f"❌ {method} {route}: {body}")
+            success = False
+        elif trips is None or trips > budget:
+            print(f"❌ {method} {route}: {trips} round trips (budget {budget})")
+            success = False
+        else:
+            print(f"✅ {method} {route}: {trips} round trips (budget {budget})")
+    return success
+
+
+def test_round_trip_budgets():
+    """Each route stays within its budget and repeats no query"""
+    assert asyncio.run(check_round_trip_budgets())
+
+
+if __name__ == "__main__":
+    success = asyncio.run(check_round_trip_budgets())
+
+    if success:
+        print("\n🎉 Round-trip budget check PASSED!")
+    else:
+        print("\n❌ Round-trip budget check FAILED!")
+        sys.exit(1)